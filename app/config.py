@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import os
+from functools import cache
 
 try:
     from dotenv import load_dotenv
 except ImportError:
     load_dotenv = None
 
-if load_dotenv:
+# O .env só é lido uma vez por ambiente (subprocessos/reloads herdam a flag)
+if load_dotenv and not os.environ.get("NEXUS_ENV_LOADED"):
     load_dotenv()
+    os.environ["NEXUS_ENV_LOADED"] = "1"
 
 
+@cache
 def _env(name: str, default: str | None = None) -> str | None:
     value = os.getenv(name)
     if value is None or value.strip() == "":
@@ -18,8 +22,14 @@ def _env(name: str, default: str | None = None) -> str | None:
     return value
 
 
+def _env_int(name: str, default: int) -> int:
+    return int(_env(name) or default)
+
+
 REDIS_URL = _env("REDIS_URL")
 POSTGRES_DSN = _env("POSTGRES_DSN")
+POSTGRES_POOL_MIN = _env_int("POSTGRES_POOL_MIN", 4)
+POSTGRES_POOL_MAX = _env_int("POSTGRES_POOL_MAX", 20)
 
 STT_PROVIDER = _env("STT_PROVIDER", "openai")
 OPENAI_API_KEY = _env("OPENAI_API_KEY")
@@ -29,5 +39,11 @@ LLM_PROVIDER = _env("LLM_PROVIDER", "rules")
 GEMINI_API_KEY = _env("GEMINI_API_KEY")
 GEMINI_MODEL = _env("GEMINI_MODEL", "gemini-1.5-flash")
 
-MAX_HISTORY = int(_env("MAX_HISTORY", "20") or "20")
-SESSION_TTL_SECONDS = int(_env("SESSION_TTL_SECONDS", "21600") or "21600")
+DB_CACHE_TTL_SECONDS = _env_int("DB_CACHE_TTL_SECONDS", 60)
+# Cargas do sync sem esperar fsync do COMMIT (dados recuperáveis da fonte)
+SYNC_FAST_BULK = _env("NEXUS_FAST_BULK", "0") == "1"
+# Cache em disco das respostas HTTP do sync de dados do jogo ("off" desativa)
+HTTP_CACHE_DIR = _env("HTTP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nexuscoach"))
+
+MAX_HISTORY = _env_int("MAX_HISTORY", 20)
+SESSION_TTL_SECONDS = _env_int("SESSION_TTL_SECONDS", 21600)
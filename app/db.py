@@ -1,155 +1,368 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any
 
+import orjson
 import psycopg
-
-from app.config import POSTGRES_DSN
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb, set_json_dumps, set_json_loads
+from psycopg_pool import ConnectionPool
+
+from app.config import (
+    DB_CACHE_TTL_SECONDS,
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    LLM_PROVIDER,
+    POSTGRES_DSN,
+    POSTGRES_POOL_MAX,
+    POSTGRES_POOL_MIN,
+    REDIS_URL,
+)
 from app.store import Session
 
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
 logger = logging.getLogger("nexuscoach")
-_tables_ready = False
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+_cache_client: "redis.Redis | None" = None
+_cache_retry_at = 0.0
+_CACHE_RETRY_SECONDS = 30.0
+# Prefixos das chaves de cache: quem grava e quem invalida usam a mesma constante
+_ADVICE_CACHE_PREFIX = "advice_rows"
+_CORRECTIONS_CACHE_PREFIX = "corrections"
+_persist_queue: queue.Queue[tuple[Session, dict[str, Any] | None]] = queue.Queue()
+_persist_thread: threading.Thread | None = None
+_persist_lock = threading.Lock()
+_extract_executor: ThreadPoolExecutor | None = None
+_PERSIST_BATCH_SIZE = 32
+_PERSIST_FLUSH_SECONDS = 0.2
+
+_SESSION_LOG_UPSERT_SQL = """
+    insert into session_logs (session_id, locale, state, history, feedback)
+    values (%s, %s, %s, %s, %s)
+    on conflict (session_id)
+    do update set
+        locale = excluded.locale,
+        state = excluded.state,
+        history = excluded.history,
+        feedback = excluded.feedback,
+        ended_at = now()
+"""
+
+_ADVICE_UPSERT_SQL = """
+    insert into advice_bank
+        (champion, lane, enemy, intent, game_phase, status, reply_text,
+         positive_count, negative_count, score)
+    select champion, lane, enemy, intent, game_phase, status, reply_text,
+           sum(positive_count), sum(negative_count), sum(score)
+    from unnest(
+        %s::text[], %s::text[], %s::text[], %s::text[], %s::text[], %s::text[],
+        %s::text[], %s::int[], %s::int[], %s::int[]
+    ) as t(champion, lane, enemy, intent, game_phase, status, reply_text,
+           positive_count, negative_count, score)
+    group by champion, lane, enemy, intent, game_phase, status, reply_text
+    on conflict (champion, lane, enemy, intent, game_phase, status, reply_text)
+    do update set
+        positive_count = advice_bank.positive_count + excluded.positive_count,
+        negative_count = advice_bank.negative_count + excluded.negative_count,
+        score = advice_bank.score + excluded.score,
+        last_seen = now()
+"""
+
+# rank_score = score + no máximo 11 pontos de contexto, então linhas com score
+# abaixo do k-ésimo maior score - 11 nunca entram no top-k; o corte usa o
+# índice advice_rank_idx em vez de ordenar a tabela inteira.
+_ADVICE_SQL = """
+    with cutoff as (
+        select score - 11 as min_score
+        from advice_bank
+        order by score desc
+        limit 1 offset %s
+    )
+    select reply_text,
+           champion,
+           intent,
+           coalesce((champion = %s)::int * 3, 0) +
+           coalesce((lane = %s)::int * 2, 0) +
+           coalesce((enemy = %s)::int * 2, 0) +
+           coalesce((intent = %s)::int * 2, 0) +
+           coalesce((game_phase = %s)::int, 0) +
+           coalesce((status = %s)::int, 0) +
+           score as rank_score,
+           score,
+           last_seen
+    from advice_bank
+    where not exists (select 1 from cutoff)
+       or score >= (select min_score from cutoff)
+    order by rank_score desc, score desc, last_seen desc
+    limit %s
+"""
+
+# Cercas de markdown (```json / ```) que o Gemini às vezes coloca em volta do JSON
+_MD_FENCE_RE = re.compile(r"```(?:json)?\s*")
+
+# Texto fixo (arrays em vez de placeholders dinâmicos) para o plano poder ser preparado;
+# sem filtros, retorna as correções de maior confiança.
+_CORRECTIONS_SQL = """
+    select champion, ability, topic, wrong_info, correct_info, confidence
+    from corrections
+    where (cardinality(%(champions)s::text[]) = 0 and cardinality(%(topics)s::text[]) = 0)
+       or lower(champion) = any(%(champions)s::text[])
+       or lower(topic) = any(%(topics)s::text[])
+    order by confidence desc, created_at desc
+    limit %(limit)s
+"""
+
+
+def _json_dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+# psycopg serializa Jsonb(...) direto com orjson (bytes, sem str intermediária)
+# e decodifica colunas json/jsonb com orjson também.
+set_json_dumps(_json_dumps)
+set_json_loads(orjson.loads)
+
+
+def get_pool() -> ConnectionPool:
+    """Pool de conexões compartilhado pelo processo (criado no primeiro uso)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    POSTGRES_DSN,
+                    min_size=POSTGRES_POOL_MIN,
+                    max_size=POSTGRES_POOL_MAX,
+                    kwargs={"autocommit": False},
+                    open=True,
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    """Fecha o pool compartilhado (shutdown do app)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def _cache() -> "redis.Redis | None":
+    """Cliente Redis para cache de leituras; None se não configurado/indisponível."""
+    global _cache_client, _cache_retry_at
+    if _cache_client is not None:
+        return _cache_client
+    if not REDIS_URL or redis is None or DB_CACHE_TTL_SECONDS <= 0:
+        return None
+    # Redis fora do ar não desliga o cache de vez: tenta de novo após um intervalo
+    now = time.monotonic()
+    if now < _cache_retry_at:
+        return None
+    try:
+        client = redis.Redis.from_url(REDIS_URL)
+        client.ping()
+        _cache_client = client
+    except Exception:
+        _cache_retry_at = now + _CACHE_RETRY_SECONDS
+        logger.warning("redis_cache_unavailable")
+    return _cache_client
 
 
-def _ensure_tables(conn: psycopg.Connection) -> None:
-    conn.execute(
-        """
-        create table if not exists session_logs (
-            session_id text primary key,
-            locale text,
-            state jsonb,
-            history jsonb,
-            feedback jsonb,
-            ended_at timestamptz default now()
-        )
-        """
-    )
-    conn.execute(
-        """
-        create table if not exists session_turns (
-            id bigserial primary key,
-            session_id text not null,
-            locale text,
-            state jsonb,
-            turn jsonb,
-            created_at timestamptz default now()
-        )
-        """
-    )
-    conn.execute(
-        """
-        create index if not exists session_turns_session_idx
-        on session_turns (session_id)
-        """
-    )
-    conn.execute(
-        """
-        create table if not exists advice_bank (
-            id bigserial primary key,
-            champion text,
-            lane text,
-            enemy text,
-            intent text,
-            game_phase text,
-            status text,
-            reply_text text not null,
-            positive_count int default 0,
-            negative_count int default 0,
-            score int default 0,
-            last_seen timestamptz default now()
-        )
-        """
-    )
-    conn.execute(
-        """
-        create unique index if not exists advice_unique
-        on advice_bank (champion, lane, enemy, intent, game_phase, status, reply_text)
-        """
-    )
-    # Tabela de correções aprendidas do feedback
-    conn.execute(
-        """
-        create table if not exists corrections (
-            id bigserial primary key,
-            champion text,
-            ability text,
-            topic text,
-            wrong_info text not null,
-            correct_info text not null,
-            source_session text,
-            confidence int default 1,
-            created_at timestamptz default now()
-        )
-        """
-    )
-    conn.execute(
-        """
-        create index if not exists corrections_champion_idx on corrections (lower(champion))
-        """
-    )
-    conn.execute(
-        """
-        create index if not exists corrections_topic_idx on corrections (lower(topic))
-        """
-    )
+def _cache_key(prefix: str, *parts: Any) -> str:
+    raw = orjson.dumps(parts, default=str)
+    return f"cache:{prefix}:{hashlib.blake2b(raw, digest_size=8).hexdigest()}"
+
+
+def _cache_get(key: str) -> Any | None:
+    client = _cache()
+    if client is None:
+        return None
+    try:
+        payload = client.get(key)
+    except Exception:
+        logger.warning("redis_cache_get_failed")
+        return None
+    return orjson.loads(payload) if payload else None
+
+
+def _cache_set(key: str, value: Any) -> None:
+    client = _cache()
+    if client is None:
+        return
+    try:
+        client.set(key, _json_dumps(value), ex=DB_CACHE_TTL_SECONDS)
+    except Exception:
+        logger.warning("redis_cache_set_failed")
+
+
+def _cache_invalidate(prefix: str) -> None:
+    client = _cache()
+    if client is None:
+        return
+    try:
+        keys = list(client.scan_iter(match=f"cache:{prefix}:*", count=500))
+        if keys:
+            client.delete(*keys)
+    except Exception:
+        logger.warning("redis_cache_invalidate_failed")
 
 
 def persist_session_end(session: Session, feedback: dict[str, Any] | None) -> None:
+    """Enfileira a gravação do fim de sessão; o worker grava em lotes em background."""
     if not POSTGRES_DSN:
         return
-    global _tables_ready
+    _start_persist_worker()
+    _persist_queue.put((session, feedback))
+    # Extração de correção (Gemini, até 30s) corre à parte: não segura o worker
+    # que grava os fins de sessão em lote
+    if feedback and feedback.get("rating") == "bad" and feedback.get("comment"):
+        _get_extract_executor().submit(
+            _extract_correction_safely, session, feedback["comment"]
+        )
+
+
+def flush_pending_writes() -> None:
+    """Bloqueia até o worker gravar tudo que já foi enfileirado."""
+    global _extract_executor
+    if _persist_thread is not None:
+        _persist_queue.join()
+    with _persist_lock:
+        executor, _extract_executor = _extract_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _get_extract_executor() -> ThreadPoolExecutor:
+    global _extract_executor
+    with _persist_lock:
+        if _extract_executor is None:
+            _extract_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="nexuscoach-extract"
+            )
+        return _extract_executor
+
+
+def _extract_correction_safely(session: Session, comment: str) -> None:
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            if not _tables_ready:
-                _ensure_tables(conn)
-                _tables_ready = True
-            conn.execute(
-                """
-                insert into session_logs (session_id, locale, state, history, feedback)
-                values (%s, %s, %s, %s, %s)
-                on conflict (session_id)
-                do update set
-                    locale = excluded.locale,
-                    state = excluded.state,
-                    history = excluded.history,
-                    feedback = excluded.feedback,
-                    ended_at = now()
-                """,
-                (
-                    session.session_id,
-                    session.locale,
-                    json.dumps(session.state),
-                    json.dumps(session.history),
-                    json.dumps(feedback) if feedback else None,
-                ),
+        extract_correction_from_feedback(
+            session_id=session.session_id,
+            feedback_comment=comment,
+            history=session.history,
+            state=session.state,
+        )
+    except Exception:
+        logger.exception("correction_extract_failed")
+
+
+def _start_persist_worker() -> None:
+    global _persist_thread
+    if _persist_thread is not None:
+        return
+    with _persist_lock:
+        if _persist_thread is None:
+            _persist_thread = threading.Thread(
+                target=_persist_worker, name="nexuscoach-persist", daemon=True
             )
-            if feedback:
-                _update_advice_from_session(conn, session, feedback)
-                # Extrai correção se feedback negativo com comentário
-                if feedback.get("rating") == "bad" and feedback.get("comment"):
-                    extract_correction_from_feedback(
-                        conn=conn,
-                        session_id=session.session_id,
-                        feedback_comment=feedback["comment"],
-                        history=session.history,
-                        state=session.state,
-                    )
+            _persist_thread.start()
+
+
+def _persist_worker() -> None:
+    while True:
+        batch = [_persist_queue.get()]
+        deadline = time.monotonic() + _PERSIST_FLUSH_SECONDS
+        while len(batch) < _PERSIST_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_persist_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _write_session_ends(batch)
+        except Exception:
+            logger.exception("postgres_persist_failed")
+        finally:
+            for _ in batch:
+                _persist_queue.task_done()
+
+
+def _write_session_ends(batch: list[tuple[Session, dict[str, Any] | None]]) -> None:
+    with get_pool().connection() as conn:
+        try:
+            # Pipeline: logs e upserts do advice_bank do lote inteiro numa só transação
+            with conn.pipeline():
+                advice_rows: list[tuple[Any, ...]] = []
+                for session, feedback in batch:
+                    _write_session_log(conn, session, feedback)
+                    if feedback:
+                        advice_rows.extend(_advice_rows(session, feedback))
+                _upsert_advice(conn, advice_rows)
             conn.commit()
-    except Exception:
-        logger.exception("postgres_persist_failed")
+        except Exception:
+            # Alguma sessão quebrou o lote: refaz uma a uma, cada uma no seu
+            # savepoint, para a ruim não levar junto os logs das outras
+            conn.rollback()
+            advice_rows = _write_session_ends_isolated(conn, batch)
+            conn.commit()
+
+    if advice_rows:
+        _cache_invalidate(_ADVICE_CACHE_PREFIX)
+
+
+def _write_session_ends_isolated(
+    conn: psycopg.Connection, batch: list[tuple[Session, dict[str, Any] | None]]
+) -> list[tuple[Any, ...]]:
+    written: list[tuple[Any, ...]] = []
+    for session, feedback in batch:
+        try:
+            with conn.transaction():
+                _write_session_log(conn, session, feedback)
+                rows = _advice_rows(session, feedback) if feedback else []
+                _upsert_advice(conn, rows)
+            written.extend(rows)
+        except Exception:
+            logger.exception("postgres_persist_failed session_id=%s", session.session_id)
+    return written
+
+
+def _write_session_log(
+    conn: psycopg.Connection, session: Session, feedback: dict[str, Any] | None
+) -> None:
+    conn.execute(
+        _SESSION_LOG_UPSERT_SQL,
+        (
+            session.session_id,
+            session.locale,
+            Jsonb(session.state),
+            Jsonb(session.history),
+            Jsonb(feedback) if feedback else None,
+        ),
+        prepare=True,
+        binary=True,
+    )
 
 
 def persist_turn(session: Session, turn: dict[str, Any]) -> None:
     if not POSTGRES_DSN:
         return
-    global _tables_ready
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            if not _tables_ready:
-                _ensure_tables(conn)
-                _tables_ready = True
+        with get_pool().connection() as conn:
             conn.execute(
                 """
                 insert into session_turns (session_id, locale, state, turn)
@@ -158,9 +371,10 @@ def persist_turn(session: Session, turn: dict[str, Any]) -> None:
                 (
                     session.session_id,
                     session.locale,
-                    json.dumps(session.state),
-                    json.dumps(turn),
+                    Jsonb(session.state),
+                    Jsonb(turn),
                 ),
+                binary=True,
             )
             conn.commit()
     except Exception:
@@ -170,13 +384,8 @@ def persist_turn(session: Session, turn: dict[str, Any]) -> None:
 def fetch_session_turns(session_id: str, limit: int = 50) -> list[dict[str, Any]]:
     if not POSTGRES_DSN:
         return []
-    global _tables_ready
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            if not _tables_ready:
-                _ensure_tables(conn)
-                conn.commit()
-                _tables_ready = True
+        with get_pool().connection() as conn:
             rows = conn.execute(
                 """
                 select turn, created_at
@@ -186,6 +395,7 @@ def fetch_session_turns(session_id: str, limit: int = 50) -> list[dict[str, Any]
                 limit %s
                 """,
                 (session_id, limit),
+                binary=True,
             ).fetchall()
             results = []
             for row in rows:
@@ -204,13 +414,8 @@ def fetch_session_turns(session_id: str, limit: int = 50) -> list[dict[str, Any]
 def fetch_recent_turns(limit: int = 50) -> list[dict[str, Any]]:
     if not POSTGRES_DSN:
         return []
-    global _tables_ready
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            if not _tables_ready:
-                _ensure_tables(conn)
-                conn.commit()
-                _tables_ready = True
+        with get_pool().connection() as conn:
             rows = conn.execute(
                 """
                 select session_id, turn, created_at
@@ -219,6 +424,7 @@ def fetch_recent_turns(limit: int = 50) -> list[dict[str, Any]]:
                 limit %s
                 """,
                 (limit,),
+                binary=True,
             ).fetchall()
             results = []
             for row in rows:
@@ -235,35 +441,22 @@ def fetch_recent_turns(limit: int = 50) -> list[dict[str, Any]]:
         return []
 
 
-def _update_advice_from_session(
-    conn: psycopg.Connection, session: Session, feedback: dict[str, Any]
-) -> None:
+def _advice_rows(session: Session, feedback: dict[str, Any]) -> list[tuple[Any, ...]]:
     rating = feedback.get("rating")
     if rating not in {"good", "bad"}:
-        return
+        return []
     positive = 1 if rating == "good" else 0
     negative = 1 if rating == "bad" else 0
     score = 1 if rating == "good" else -1
 
+    rows = []
     for item in session.history:
         context = item.get("context") or {}
         intent = item.get("intent")
         reply = item.get("reply")
         if not reply:
             continue
-        conn.execute(
-            """
-            insert into advice_bank
-                (champion, lane, enemy, intent, game_phase, status, reply_text,
-                 positive_count, negative_count, score)
-            values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            on conflict (champion, lane, enemy, intent, game_phase, status, reply_text)
-            do update set
-                positive_count = advice_bank.positive_count + excluded.positive_count,
-                negative_count = advice_bank.negative_count + excluded.negative_count,
-                score = advice_bank.score + excluded.score,
-                last_seen = now()
-            """,
+        rows.append(
             (
                 context.get("champion") or session.state.get("champion"),
                 context.get("lane") or session.state.get("lane"),
@@ -275,47 +468,69 @@ def _update_advice_from_session(
                 positive,
                 negative,
                 score,
-            ),
+            )
         )
+    return rows
+
+
+def _upsert_advice(conn: psycopg.Connection, rows: list[tuple[Any, ...]]) -> None:
+    if not rows:
+        return
+    # Um único statement com arrays (unnest) para o lote inteiro; o group by
+    # soma itens repetidos, que o on conflict não aceita duas vezes no mesmo insert
+    conn.execute(
+        _ADVICE_UPSERT_SQL, [list(column) for column in zip(*rows)], binary=True
+    )
 
 
-def retrieve_advice(state: dict[str, Any], intent: str, limit: int = 3) -> list[str]:
+def retrieve_advice(
+    state: dict[str, Any], intent: str, limit: int = 3
+) -> list[dict[str, Any]]:
+    """Dicas do advice bank já ranqueadas, com campeão, intenção e score de cada uma."""
     if not POSTGRES_DSN:
         return []
-    global _tables_ready
+    cache_key = _cache_key(
+        _ADVICE_CACHE_PREFIX,
+        state.get("champion"),
+        state.get("lane"),
+        state.get("enemy"),
+        intent,
+        state.get("game_phase"),
+        state.get("status"),
+        limit,
+    )
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            if not _tables_ready:
-                _ensure_tables(conn)
-                conn.commit()
-                _tables_ready = True
-            rows = conn.execute(
-                """
-                select reply_text,
-                       (case when champion = %s then 3 else 0 end) +
-                       (case when lane = %s then 2 else 0 end) +
-                       (case when enemy = %s then 2 else 0 end) +
-                       (case when intent = %s then 2 else 0 end) +
-                       (case when game_phase = %s then 1 else 0 end) +
-                       (case when status = %s then 1 else 0 end) +
-                       score as rank_score,
-                       score,
-                       last_seen
-                from advice_bank
-                order by rank_score desc, score desc, last_seen desc
-                limit %s
-                """,
-                (
-                    state.get("champion"),
-                    state.get("lane"),
-                    state.get("enemy"),
-                    intent,
-                    state.get("game_phase"),
-                    state.get("status"),
-                    limit,
-                ),
-            ).fetchall()
-            return [row[0] for row in rows if row and row[0]]
+        with get_pool().connection() as conn:
+            with conn.cursor(row_factory=dict_row, binary=True) as cur:
+                rows = cur.execute(
+                    _ADVICE_SQL,
+                    (
+                        max(limit - 1, 0),
+                        state.get("champion"),
+                        state.get("lane"),
+                        state.get("enemy"),
+                        intent,
+                        state.get("game_phase"),
+                        state.get("status"),
+                        limit,
+                    ),
+                    prepare=True,
+                ).fetchall()
+            advice = [
+                {
+                    "reply_text": row["reply_text"],
+                    "champion": row["champion"],
+                    "intent": row["intent"],
+                    "score": row["score"],
+                }
+                for row in rows
+                if row["reply_text"]
+            ]
+        _cache_set(cache_key, advice)
+        return advice
     except Exception:
         logger.exception("advice_retrieve_failed")
         return []
@@ -330,31 +545,20 @@ def _write_correction(
     correct_info: str,
     source_session: str | None,
 ) -> None:
-    existing = conn.execute(
-        """
-        select id, confidence from corrections
-        where lower(coalesce(champion, '')) = lower(coalesce(%s, ''))
-          and lower(coalesce(ability, '')) = lower(coalesce(%s, ''))
-          and lower(coalesce(topic, '')) = lower(coalesce(%s, ''))
-          and lower(correct_info) = lower(%s)
-        limit 1
-        """,
-        (champion, ability, topic, correct_info),
-    ).fetchone()
-
-    if existing:
-        conn.execute(
-            "update corrections set confidence = confidence + 1 where id = %s",
-            (existing[0],),
-        )
-        return
-
     conn.execute(
         """
         insert into corrections (champion, ability, topic, wrong_info, correct_info, source_session)
         values (%s, %s, %s, %s, %s, %s)
+        on conflict (
+            (lower(coalesce(champion, ''))),
+            (lower(coalesce(ability, ''))),
+            (lower(coalesce(topic, ''))),
+            (lower(correct_info))
+        )
+        do update set confidence = corrections.confidence + 1
         """,
         (champion, ability, topic, wrong_info, correct_info, source_session),
+        binary=True,
     )
 
 
@@ -372,8 +576,7 @@ def save_correction(
         return False
     try:
         if conn is None:
-            with psycopg.connect(POSTGRES_DSN) as local_conn:
-                _ensure_tables(local_conn)
+            with get_pool().connection() as local_conn:
                 _write_correction(
                     local_conn,
                     champion,
@@ -384,9 +587,9 @@ def save_correction(
                     source_session,
                 )
                 local_conn.commit()
+            _cache_invalidate(_CORRECTIONS_CACHE_PREFIX)
             return True
 
-        _ensure_tables(conn)
         _write_correction(
             conn,
             champion,
@@ -410,58 +613,49 @@ def retrieve_corrections(
     """Recupera correções relevantes para incluir no prompt."""
     if not POSTGRES_DSN:
         return []
-    global _tables_ready
+    cache_key = _cache_key(_CORRECTIONS_CACHE_PREFIX, champions, topics, limit)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            if not _tables_ready:
-                _ensure_tables(conn)
-                conn.commit()
-                _tables_ready = True
+        with get_pool().connection() as conn:
             # Busca correções que matcham os campeões ou tópicos
-            conditions = []
-            params: list[Any] = []
+            with conn.cursor(row_factory=dict_row, binary=True) as cur:
+                corrections = cur.execute(
+                    _CORRECTIONS_SQL,
+                    {
+                        "champions": [c.lower() for c in champions or []],
+                        "topics": [t.lower() for t in topics or []],
+                        "limit": limit,
+                    },
+                    prepare=True,
+                ).fetchall()
+        _cache_set(cache_key, corrections)
+        return corrections
+    except Exception:
+        logger.exception("retrieve_corrections_failed")
+        return []
 
-            if champions:
-                placeholders = ", ".join(["%s"] * len(champions))
-                conditions.append(f"lower(champion) in ({placeholders})")
-                params.extend([c.lower() for c in champions])
 
-            if topics:
-                placeholders = ", ".join(["%s"] * len(topics))
-                conditions.append(f"lower(topic) in ({placeholders})")
-                params.extend([t.lower() for t in topics])
+@lru_cache(maxsize=1)
+def get_genai_client() -> Any:
+    """Cliente Gemini único do processo (respostas e extrações reusam a sessão HTTP/TLS)."""
+    from google import genai
 
-            where_clause = ""
-            if conditions:
-                where_clause = "where " + " or ".join(conditions)
+    return genai.Client(
+        api_key=GEMINI_API_KEY,
+        http_options={"timeout": 30000},
+    )
 
-            params.append(limit)
 
-            rows = conn.execute(
-                f"""
-                select champion, ability, topic, wrong_info, correct_info, confidence
-                from corrections
-                {where_clause}
-                order by confidence desc, created_at desc
-                limit %s
-                """,
-                params,
-            ).fetchall()
+@lru_cache(maxsize=1)
+def _correction_config() -> Any:
+    from google.genai import types as genai_types
 
-            return [
-                {
-                    "champion": row[0],
-                    "ability": row[1],
-                    "topic": row[2],
-                    "wrong_info": row[3],
-                    "correct_info": row[4],
-                    "confidence": row[5],
-                }
-                for row in rows
-            ]
-    except Exception:
-        logger.exception("retrieve_corrections_failed")
-        return []
+    return genai_types.GenerateContentConfig(
+        temperature=0.1,
+        max_output_tokens=200,
+    )
 
 
 def extract_correction_from_feedback(
@@ -478,15 +672,11 @@ def extract_correction_from_feedback(
     if not feedback_comment or len(feedback_comment.strip()) < 10:
         return False
 
-    # Importa aqui para evitar circular import
-    from app.config import GEMINI_API_KEY, GEMINI_MODEL, LLM_PROVIDER
-
     if LLM_PROVIDER != "gemini" or not GEMINI_API_KEY:
         return False
 
     try:
-        from google import genai
-        from google.genai import types as genai_types
+        config = _correction_config()
     except ImportError:
         return False
 
@@ -518,19 +708,12 @@ Se o feedback é apenas reclamação geral sem correção específica, responda:
 Responda APENAS o JSON, nada mais."""
 
     try:
-        logger.info("extract_correction: creating client...")
-        client = genai.Client(
-            api_key=GEMINI_API_KEY,
-            http_options={"timeout": 30000},
-        )
+        client = get_genai_client()
         logger.info("extract_correction: calling generate_content...")
         response = client.models.generate_content(
             model=GEMINI_MODEL,
             contents=prompt,
-            config=genai_types.GenerateContentConfig(
-                temperature=0.1,
-                max_output_tokens=200,
-            ),
+            config=config,
         )
         logger.info(f"extract_correction: got response: {response.text[:100] if response and response.text else 'None'}")
 
@@ -538,13 +721,11 @@ Responda APENAS o JSON, nada mais."""
             return False
 
         # Parse JSON da resposta
-        import re
         text = response.text.strip()
         # Remove markdown se houver
-        text = re.sub(r"```json\s*", "", text)
-        text = re.sub(r"```\s*", "", text)
+        text = _MD_FENCE_RE.sub("", text)
 
-        data = json.loads(text)
+        data = orjson.loads(text)
 
         if data.get("no_correction"):
             return False
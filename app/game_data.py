@@ -7,15 +7,30 @@ Fontes:
 """
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import os
 import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from importlib.resources import files
+from itertools import chain
 from typing import Any
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
 
+import orjson
 import psycopg
-from urllib.request import urlopen, Request
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
 
-from app.config import POSTGRES_DSN
+from app.config import HTTP_CACHE_DIR, POSTGRES_DSN, SYNC_FAST_BULK
+from app.db import get_pool
 
 logger = logging.getLogger("nexuscoach")
 
@@ -30,6 +45,8 @@ TENCENT_HERO_DETAIL_CANDIDATES = [
     "https://game.gtimg.cn/images/lgamem/act/lrlib/js/hero/hero_{}.js",
     "https://game.gtimg.cn/images/lol/act/img/js/hero/{}.js",
 ]
+# Índice do último template de TENCENT_HERO_DETAIL_CANDIDATES que respondeu
+_tencent_template_idx = 0
 
 # Mapeamento de roles chinês -> português
 ROLE_MAP = {
@@ -59,18 +76,260 @@ POSITION_MAP = {
     "5": "support",
 }
 
+# Requisições HTTP simultâneas nos fetches por campeão
+FETCH_WORKERS = 20
+
+# Linhas por INSERT multi-VALUES (fica bem abaixo do limite de 65535 parâmetros)
+INSERT_CHUNK_SIZE = 1000
+
+# Colunas carregadas via COPY pelos sync_* (ordem das tuplas de linha)
+CHAMPION_COLUMNS = [
+    "hero_id", "name_cn", "name_en", "title", "alias", "roles", "lanes",
+    "difficulty", "damage", "survivability", "utility", "icon_url",
+]
+STATS_COLUMNS = [
+    "hero_id", "health_base", "health_scale", "mana_base", "mana_scale",
+    "armor_base", "armor_scale", "magic_resist_base", "magic_resist_scale",
+    "attack_base", "attack_scale", "attack_speed_base", "attack_speed_scale",
+    "move_speed",
+]
+ABILITY_COLUMNS = ["hero_id", "champion_name", "ability_key", "ability_name", "description"]
+ITEM_COLUMNS = [
+    "name", "name_normalized", "category", "gold_cost", "stats", "passive_name",
+    "passive_desc", "tags",
+]
+WINRATE_COLUMNS = [
+    "hero_id", "position", "win_rate", "pick_rate", "ban_rate", "strength_tier", "stat_date",
+]
+
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+# Chaves alternativas de nome/descrição nos payloads de habilidades, por prioridade
+_PASSIVE_NAME_KEYS = ("name", "abilityName")
+_PASSIVE_DESC_KEYS = ("description", "tooltip", "desc")
+_FLAT_PASSIVE_NAME_KEYS = ("passiveName", "passive_name")
+_FLAT_PASSIVE_DESC_KEYS = ("passiveDesc", "passive_description")
+_SPELL_NAME_KEYS = ("name", "abilityName", "spellName")
+_SPELL_DESC_KEYS = ("description", "tooltip", "desc", "spellDesc")
+_ABILITY_ROOT_KEYS = frozenset(
+    ("spells", "skills", "abilities", "passive", "passiveName", "passiveDesc")
+)
+
+# Padrões comuns: +55 AD, +250 HP, +25% Crit, etc. Uma única varredura do texto;
+# só AS/Crit/MPen/Omnivamp/HSS aceitam "%".
+_ITEM_STAT_RE = re.compile(
+    r"\+(?:(?P<flat>\d+)\s*(?P<flat_key>AD|AP|HP|Mana|Armor|MR|Haste)"
+    r"|(?P<pct>\d+)%?\s*(?P<pct_key>AS|Crit|MPen|Omnivamp|HSS))",
+    re.IGNORECASE,
+)
+_ITEM_STAT_KEYS = {
+    "AD": "attack_damage",
+    "AP": "ability_power",
+    "HP": "health",
+    "MANA": "mana",
+    "ARMOR": "armor",
+    "MR": "magic_resist",
+    "AS": "attack_speed",
+    "CRIT": "crit_chance",
+    "HASTE": "ability_haste",
+    "MPEN": "magic_pen",
+    "OMNIVAMP": "omnivamp",
+    "HSS": "heal_shield_power",
+}
+
+# Pattern para extrair dados de itens
+# Procura por blocos de item com nome, gold, stats e passiva
+_ITEM_BLOCK_RE = re.compile(
+    r'<h[23][^>]*>([^<]+)</h[23]>'  # Nome do item
+    r'.*?'
+    r'(\d{2,4})\s*(?:Gold|gold|G)'  # Custo em gold
+    r'.*?'
+    r'((?:\+\d+[^<]{1,30})+)'  # Stats
+    r'.*?'
+    r'(?:Passive|PASSIVE|passive)[:\s]*([^<]+)',  # Passiva
+    re.DOTALL | re.IGNORECASE
+)
+
+# Pattern alternativo mais simples
+_ITEM_SIMPLE_RE = re.compile(
+    r'<strong>([^<]+)</strong>\s*'
+    r'.*?(\d{2,4})\s*Gold'
+    r'.*?Stats:\s*([^<]+)'
+    r'.*?(?:Passive:?\s*)?([^<]{10,200})',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Lista de itens conhecidos do wr-meta (extraídos manualmente como fallback),
+# carregada uma vez de app/data/items.json
+_KNOWN_ITEMS: tuple[dict[str, Any], ...] = tuple(
+    orjson.loads(files("app.data").joinpath("items.json").read_bytes())
+)
+
+
+# Cache do payload do wr-database dentro de um ciclo de sync
+WRDB_CACHE_SECONDS = 300
+_wrdb_cache: tuple[float, Any] | None = None
+_wrdb_lock = threading.Lock()
+
+
+class _TTLCache:
+    """Cache em memória com expiração, para getters de leitura frequente."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict[Any, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            return entry[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Descarta a entrada mais antiga (ordem de inserção)
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Metadados só mudam no sync; sync_all limpa os caches ao terminar
+_champion_cache = _TTLCache(512, 300)
+_item_cache = _TTLCache(1024, 300)
+_winrate_cache = _TTLCache(512, 60)
+_bundle_cache = _TTLCache(512, 60)
+_counter_items_cache = _TTLCache(64, 300)
+
+# Conexões keep-alive por thread, uma por (scheme, host)
+_http_local = threading.local()
+_HTTP_HEADERS = {"User-Agent": "NexusCoach/1.0"}
+HTTP_CACHE_VERSION = 1
+
+
+def _http_cache_paths(url: str) -> tuple[str, str] | None:
+    if not HTTP_CACHE_DIR or HTTP_CACHE_DIR == "off":
+        return None
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, digest)
+    return f"{base}.body", f"{base}.json"
+
+
+def _http_cache_load(url: str) -> tuple[bytes, dict[str, Any]] | None:
+    """Resposta salva da URL e seus validadores (ETag/Last-Modified), se houver."""
+    paths = _http_cache_paths(url)
+    if paths is None:
+        return None
+    try:
+        with open(paths[1], "rb") as f:
+            meta = orjson.loads(f.read())
+        if meta.get("version") != HTTP_CACHE_VERSION or meta.get("url") != url:
+            return None
+        with open(paths[0], "rb") as f:
+            return f.read(), meta
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+
+def _http_cache_store(url: str, body: bytes, etag: str | None, last_modified: str | None) -> None:
+    paths = _http_cache_paths(url)
+    if paths is None or not (etag or last_modified):
+        return
+    meta = {
+        "version": HTTP_CACHE_VERSION,
+        "url": url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "ts": time.time(),
+    }
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        # Escreve em arquivo temporário e troca, para nunca ler um corpo pela metade
+        for path, data in ((paths[0], body), (paths[1], orjson.dumps(meta))):
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+    except OSError:
+        logger.warning("http_cache_store_failed url=%s", url)
+
+
+def _http_get(url: str, redirects: int = 5) -> bytes:
+    """
+    GET reaproveitando a conexão aberta da thread para o mesmo host. Respostas
+    com ETag/Last-Modified ficam em disco e são revalidadas (304) nas próximas
+    execuções.
+    """
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    conns = getattr(_http_local, "conns", None)
+    if conns is None:
+        conns = _http_local.conns = {}
+
+    cached = _http_cache_load(url)
+    headers = dict(_HTTP_HEADERS)
+    if cached is not None:
+        if cached[1].get("etag"):
+            headers["If-None-Match"] = cached[1]["etag"]
+        if cached[1].get("last_modified"):
+            headers["If-Modified-Since"] = cached[1]["last_modified"]
+
+    for attempt in range(2):
+        conn = conns.get(key)
+        if conn is None:
+            conn_cls = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+            conn = conns[key] = conn_cls(parts.netloc, timeout=30)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            break
+        except (HTTPException, OSError):
+            # Servidor pode ter fechado a conexão ociosa; reconecta uma vez
+            conn.close()
+            del conns[key]
+            if attempt:
+                raise
+
+    if response.status == 304 and cached is not None:
+        return cached[0]
+    if response.status in (301, 302, 303, 307, 308) and redirects:
+        return _http_get(urljoin(url, response.getheader("Location", "")), redirects - 1)
+    if response.status >= 400:
+        raise HTTPError(url, response.status, response.reason, response.headers, None)
+    _http_cache_store(url, body, response.getheader("ETag"), response.getheader("Last-Modified"))
+    return body
+
 
 def _fetch_json(url: str) -> Any:
     """Busca JSON de uma URL."""
-    req = Request(url, headers={"User-Agent": "NexusCoach/1.0"})
-    with urlopen(req, timeout=30) as response:
-        return json.loads(response.read().decode("utf-8"))
+    return orjson.loads(_http_get(url))
 
 
 def _fetch_text(url: str) -> str:
-    req = Request(url, headers={"User-Agent": "NexusCoach/1.0"})
-    with urlopen(req, timeout=30) as response:
-        return response.read().decode("utf-8")
+    return _http_get(url).decode("utf-8")
+
+
+def _fetch_wrdb_champions() -> Any:
+    """Payload de campeões do wr-database, reaproveitado entre stats e habilidades."""
+    global _wrdb_cache
+    with _wrdb_lock:
+        now = time.monotonic()
+        if _wrdb_cache is not None and _wrdb_cache[0] > now:
+            return _wrdb_cache[1]
+        data = _fetch_json(WR_DATABASE_CHAMPIONS)
+        _wrdb_cache = (now + WRDB_CACHE_SECONDS, data)
+        return data
 
 
 def _fetch_json_loose(url: str) -> Any | None:
@@ -87,125 +346,20 @@ def _fetch_json_loose(url: str) -> Any | None:
     if start == -1 or end == -1 or start >= end:
         return None
     try:
-        return json.loads(text[start : end + 1])
+        return orjson.loads(text[start : end + 1])
     except Exception:
         return None
 
 
-def _ensure_game_tables(conn: psycopg.Connection) -> None:
-    """Cria tabelas para dados do jogo."""
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS champions (
-            hero_id TEXT PRIMARY KEY,
-            name_cn TEXT,
-            name_en TEXT,
-            title TEXT,
-            alias TEXT,
-            roles TEXT[],
-            lanes TEXT[],
-            difficulty INT,
-            damage INT,
-            survivability INT,
-            utility INT,
-            icon_url TEXT,
-            updated_at TIMESTAMPTZ DEFAULT NOW()
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS champion_stats (
-            hero_id TEXT PRIMARY KEY REFERENCES champions(hero_id),
-            health_base NUMERIC,
-            health_scale NUMERIC,
-            mana_base NUMERIC,
-            mana_scale NUMERIC,
-            armor_base NUMERIC,
-            armor_scale NUMERIC,
-            magic_resist_base NUMERIC,
-            magic_resist_scale NUMERIC,
-            attack_base NUMERIC,
-            attack_scale NUMERIC,
-            attack_speed_base NUMERIC,
-            attack_speed_scale NUMERIC,
-            move_speed INT,
-            updated_at TIMESTAMPTZ DEFAULT NOW()
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS champion_abilities (
-            id BIGSERIAL PRIMARY KEY,
-            hero_id TEXT REFERENCES champions(hero_id),
-            champion_name TEXT,
-            ability_key TEXT,
-            ability_name TEXT,
-            description TEXT,
-            updated_at TIMESTAMPTZ DEFAULT NOW(),
-            UNIQUE(hero_id, ability_key)
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS champion_winrates (
-            id BIGSERIAL PRIMARY KEY,
-            hero_id TEXT REFERENCES champions(hero_id),
-            position TEXT,
-            win_rate NUMERIC,
-            pick_rate NUMERIC,
-            ban_rate NUMERIC,
-            strength_tier INT,
-            stat_date DATE,
-            updated_at TIMESTAMPTZ DEFAULT NOW(),
-            UNIQUE(hero_id, position, stat_date)
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS matchup_tips (
-            id BIGSERIAL PRIMARY KEY,
-            champion TEXT NOT NULL,
-            enemy TEXT NOT NULL,
-            lane TEXT,
-            difficulty INT,
-            tips TEXT[],
-            counter_items TEXT[],
-            power_spikes TEXT[],
-            positive_count INT DEFAULT 0,
-            negative_count INT DEFAULT 0,
-            score INT DEFAULT 0,
-            updated_at TIMESTAMPTZ DEFAULT NOW(),
-            UNIQUE(champion, enemy, lane)
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS items (
-            item_id SERIAL PRIMARY KEY,
-            name TEXT UNIQUE NOT NULL,
-            name_normalized TEXT,
-            category TEXT,
-            gold_cost INT,
-            stats JSONB,
-            passive_name TEXT,
-            passive_desc TEXT,
-            tags TEXT[],
-            updated_at TIMESTAMPTZ DEFAULT NOW()
-        )
-        """
-    )
-    conn.commit()
-
-
 def _strip_html(text: str | None) -> str:
     if not text:
         return ""
-    return re.sub(r"<[^>]+>", "", text).replace("&nbsp;", " ").strip()
+    return _HTML_TAG_RE.sub("", text).replace("&nbsp;", " ").strip()
+
+
+def _first_value(data: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    """Primeiro valor não vazio entre as chaves, na ordem; "" se nenhum."""
+    return next((value for key in keys if (value := data.get(key))), "")
 
 
 def _extract_abilities(champ: dict[str, Any]) -> list[dict[str, str]]:
@@ -213,55 +367,31 @@ def _extract_abilities(champ: dict[str, Any]) -> list[dict[str, str]]:
 
     passive = champ.get("passive")
     if isinstance(passive, dict):
-        name = passive.get("name") or passive.get("abilityName") or ""
-        desc = (
-            passive.get("description")
-            or passive.get("tooltip")
-            or passive.get("desc")
-            or ""
-        )
-        if name or desc:
-            abilities.append(
-                {
-                    "key": "passive",
-                    "name": _strip_html(name),
-                    "description": _strip_html(desc),
-                }
-            )
+        name = _first_value(passive, _PASSIVE_NAME_KEYS)
+        desc = _first_value(passive, _PASSIVE_DESC_KEYS)
     else:
-        name = champ.get("passiveName") or champ.get("passive_name") or ""
-        desc = champ.get("passiveDesc") or champ.get("passive_description") or ""
-        if name or desc:
-            abilities.append(
-                {
-                    "key": "passive",
-                    "name": _strip_html(name),
-                    "description": _strip_html(desc),
-                }
-            )
+        name = _first_value(champ, _FLAT_PASSIVE_NAME_KEYS)
+        desc = _first_value(champ, _FLAT_PASSIVE_DESC_KEYS)
+    if name or desc:
+        abilities.append(
+            {
+                "key": "passive",
+                "name": _strip_html(name),
+                "description": _strip_html(desc),
+            }
+        )
 
-    spells = champ.get("spells") or champ.get("abilities") or champ.get("skills")
+    spells = _first_value(champ, ("spells", "abilities", "skills"))
     if isinstance(spells, dict):
-        spells = spells.get("spells") or spells.get("skills") or spells.get("abilities")
+        spells = _first_value(spells, ("spells", "skills", "abilities"))
     if isinstance(spells, list):
         keys = ["q", "w", "e", "r"]
         for idx, spell in enumerate(spells):
             if not isinstance(spell, dict):
                 continue
             key = keys[idx] if idx < len(keys) else f"skill_{idx + 1}"
-            name = (
-                spell.get("name")
-                or spell.get("abilityName")
-                or spell.get("spellName")
-                or ""
-            )
-            desc = (
-                spell.get("description")
-                or spell.get("tooltip")
-                or spell.get("desc")
-                or spell.get("spellDesc")
-                or ""
-            )
+            name = _first_value(spell, _SPELL_NAME_KEYS)
+            desc = _first_value(spell, _SPELL_DESC_KEYS)
             if name or desc:
                 abilities.append(
                     {
@@ -275,26 +405,16 @@ def _extract_abilities(champ: dict[str, Any]) -> list[dict[str, str]]:
 
 
 def _find_abilities_root(node: Any) -> dict[str, Any] | None:
-    if isinstance(node, dict):
-        for key in (
-            "spells",
-            "skills",
-            "abilities",
-            "passive",
-            "passiveName",
-            "passiveDesc",
-        ):
-            if key in node:
-                return node
-        for value in node.values():
-            found = _find_abilities_root(value)
-            if found:
-                return found
-    elif isinstance(node, list):
-        for item in node:
-            found = _find_abilities_root(item)
-            if found:
-                return found
+    # DFS em pré-ordem com pilha explícita (mesma ordem da versão recursiva)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if not _ABILITY_ROOT_KEYS.isdisjoint(current):
+                return current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
     return None
 
 
@@ -330,14 +450,90 @@ def _fetch_champion_detail(champ: dict[str, Any]) -> dict[str, Any] | None:
 
 
 def _fetch_tencent_hero_detail(hero_id: str) -> dict[str, Any] | None:
-    for template in TENCENT_HERO_DETAIL_CANDIDATES:
-        url = template.format(hero_id)
+    global _tencent_template_idx
+    # Tenta primeiro o template que funcionou por último; os demais só se falhar
+    first = _tencent_template_idx
+    order = [first] + [i for i in range(len(TENCENT_HERO_DETAIL_CANDIDATES)) if i != first]
+    for idx in order:
+        url = TENCENT_HERO_DETAIL_CANDIDATES[idx].format(hero_id)
         payload = _fetch_json_loose(url)
         if isinstance(payload, dict):
+            _tencent_template_idx = idx
             return payload
     return None
 
 
+@contextmanager
+def _sync_connect() -> Iterator[psycopg.Connection]:
+    """Conexão usada pelos sync_*; statements repetidos viram prepared já na 2ª execução."""
+    with get_pool().connection() as conn:
+        previous_threshold = conn.prepare_threshold
+        conn.prepare_threshold = 1
+        try:
+            if SYNC_FAST_BULK:
+                # Dados re-sincronizáveis da fonte: dispensa o fsync do COMMIT desta carga
+                conn.execute(
+                    "SET LOCAL synchronous_commit = off; SET LOCAL work_mem = '64MB'",
+                    prepare=False,
+                )
+            yield conn
+        finally:
+            conn.prepare_threshold = previous_threshold
+
+
+def _copy_upsert(
+    conn: psycopg.Connection,
+    target: str,
+    columns: list[str],
+    rows: list[tuple[Any, ...]],
+    conflict_cols: list[str],
+    update_cols: list[str],
+    replace_key: str | None = None,
+) -> int:
+    """
+    Carrega linhas via COPY numa tabela temporária e faz um único
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE na tabela de destino.
+    Com replace_key, as linhas do destino cujo valor dessa coluna aparece no
+    lote são apagadas antes do merge.
+    """
+    # O upsert não pode tocar a mesma chave duas vezes; a última linha vence,
+    # como acontecia com um INSERT por linha.
+    key_idx = [columns.index(col) for col in conflict_cols]
+    unique_rows = list({tuple(row[i] for i in key_idx): row for row in rows}.values())
+    if not unique_rows:
+        return 0
+
+    staging = f"stg_{target}"
+    col_list = ", ".join(columns)
+    updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_cols)
+    conn.execute(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {col_list} FROM {target} WITH NO DATA"
+    )
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY {staging} ({col_list}) FROM STDIN") as copy:
+            for row in unique_rows:
+                copy.write_row(row)
+    # COPY não roda em modo pipeline; o resto do merge vai num único flush
+    with conn.pipeline():
+        if replace_key:
+            conn.execute(
+                f"DELETE FROM {target} WHERE {replace_key} IN "
+                f"(SELECT {replace_key} FROM {staging})"
+            )
+        conn.execute(
+            f"""
+            INSERT INTO {target} ({col_list})
+            SELECT {col_list} FROM {staging}
+            ON CONFLICT ({", ".join(conflict_cols)}) DO UPDATE SET
+                {updates},
+                updated_at = NOW()
+            """
+        )
+        conn.execute(f"DROP TABLE {staging}")
+    return len(unique_rows)
+
+
 def sync_champions_from_tencent() -> dict[str, str]:
     """
     Sincroniza lista de campeões da API Tencent.
@@ -352,62 +548,52 @@ def sync_champions_from_tencent() -> dict[str, str]:
     hero_list = data.get("heroList", {})
 
     hero_map = {}
-
-    with psycopg.connect(POSTGRES_DSN) as conn:
-        _ensure_game_tables(conn)
-
-        for hero_id, hero in hero_list.items():
-            # Parse roles
-            roles_cn = hero.get("roles", [])
-            roles = [ROLE_MAP.get(r, r.lower()) for r in roles_cn]
-
-            # Parse lanes
-            lanes_str = hero.get("lane", "")
-            lanes_cn = [l.strip() for l in lanes_str.split(";") if l.strip()]
-            lanes = [LANE_MAP.get(l, l.lower()) for l in lanes_cn]
-
-            # Alias como nome em inglês (romanizado)
-            alias = hero.get("alias", "")
-            name_en = alias.replace("·", " ").title() if alias else ""
-
-            hero_map[hero_id] = name_en or hero.get("name", "")
-
-            conn.execute(
-                """
-                INSERT INTO champions (
-                    hero_id, name_cn, name_en, title, alias, roles, lanes,
-                    difficulty, damage, survivability, utility, icon_url
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (hero_id) DO UPDATE SET
-                    name_cn = EXCLUDED.name_cn,
-                    name_en = EXCLUDED.name_en,
-                    title = EXCLUDED.title,
-                    alias = EXCLUDED.alias,
-                    roles = EXCLUDED.roles,
-                    lanes = EXCLUDED.lanes,
-                    difficulty = EXCLUDED.difficulty,
-                    damage = EXCLUDED.damage,
-                    survivability = EXCLUDED.survivability,
-                    utility = EXCLUDED.utility,
-                    icon_url = EXCLUDED.icon_url,
-                    updated_at = NOW()
-                """,
-                (
-                    hero_id,
-                    hero.get("name"),
-                    name_en,
-                    hero.get("title"),
-                    alias,
-                    roles,
-                    lanes,
-                    int(hero.get("difficultyL", 0)),
-                    int(hero.get("damage", 0)),
-                    int(hero.get("surviveL", 0)),
-                    int(hero.get("assistL", 0)),
-                    hero.get("avatar"),
-                ),
+    rows = []
+    role_get = ROLE_MAP.get
+    lane_get = LANE_MAP.get
+
+    for hero_id, hero in hero_list.items():
+        # Parse roles
+        roles_cn = hero.get("roles", [])
+        roles = [role_get(r, r.lower()) for r in roles_cn]
+
+        # Parse lanes
+        lanes_str = hero.get("lane", "")
+        lanes_cn = [l.strip() for l in lanes_str.split(";") if l.strip()]
+        lanes = [lane_get(l, l.lower()) for l in lanes_cn]
+
+        # Alias como nome em inglês (romanizado)
+        alias = hero.get("alias", "")
+        name_en = alias.replace("·", " ").title() if alias else ""
+
+        hero_map[hero_id] = name_en or hero.get("name", "")
+
+        rows.append(
+            (
+                hero_id,
+                hero.get("name"),
+                name_en,
+                hero.get("title"),
+                alias,
+                roles,
+                lanes,
+                int(hero.get("difficultyL", 0)),
+                int(hero.get("damage", 0)),
+                int(hero.get("surviveL", 0)),
+                int(hero.get("assistL", 0)),
+                hero.get("avatar"),
             )
+        )
 
+    with _sync_connect() as conn:
+        _copy_upsert(
+            conn,
+            "champions",
+            CHAMPION_COLUMNS,
+            rows,
+            ["hero_id"],
+            CHAMPION_COLUMNS[1:],
+        )
         conn.commit()
         logger.info(f"Synced {len(hero_list)} champions from Tencent")
 
@@ -423,12 +609,15 @@ def sync_champion_stats() -> int:
         return 0
 
     logger.info("Fetching champion stats from wr-database...")
-    data = _fetch_json(WR_DATABASE_CHAMPIONS)
+    data = _fetch_wrdb_champions()
     champions = data.get("champions_data", [])
 
     count = 0
-    with psycopg.connect(POSTGRES_DSN) as conn:
-        _ensure_game_tables(conn)
+    rows = []
+    placeholders = []
+    with _sync_connect() as conn:
+        # Campeões já cadastrados, lidos uma vez em vez de um SELECT por linha
+        existing = {row[0] for row in conn.execute("SELECT hero_id FROM champions")}
 
         for champ in champions:
             hero_id = champ.get("heroId")
@@ -437,50 +626,15 @@ def sync_champion_stats() -> int:
 
             hero_id_str = str(hero_id)
 
-            # Verifica se o campeão existe na tabela champions
-            exists = conn.execute(
-                "SELECT 1 FROM champions WHERE hero_id = %s", (hero_id_str,)
-            ).fetchone()
-
-            if not exists:
-                # Insere campeão básico se não existir
-                conn.execute(
-                    """
-                    INSERT INTO champions (hero_id, name_en, alias)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (hero_id) DO NOTHING
-                    """,
-                    (hero_id_str, champ.get("name", ""), champ.get("id", "")),
-                )
+            if hero_id_str not in existing:
+                # Campeão básico inserido em lote antes dos stats (FK)
+                placeholders.append((hero_id_str, champ.get("name", ""), champ.get("id", "")))
 
             mana_base = champ.get("manaBase")
             if mana_base is False:
                 mana_base = None
 
-            conn.execute(
-                """
-                INSERT INTO champion_stats (
-                    hero_id, health_base, health_scale, mana_base, mana_scale,
-                    armor_base, armor_scale, magic_resist_base, magic_resist_scale,
-                    attack_base, attack_scale, attack_speed_base, attack_speed_scale,
-                    move_speed
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (hero_id) DO UPDATE SET
-                    health_base = EXCLUDED.health_base,
-                    health_scale = EXCLUDED.health_scale,
-                    mana_base = EXCLUDED.mana_base,
-                    mana_scale = EXCLUDED.mana_scale,
-                    armor_base = EXCLUDED.armor_base,
-                    armor_scale = EXCLUDED.armor_scale,
-                    magic_resist_base = EXCLUDED.magic_resist_base,
-                    magic_resist_scale = EXCLUDED.magic_resist_scale,
-                    attack_base = EXCLUDED.attack_base,
-                    attack_scale = EXCLUDED.attack_scale,
-                    attack_speed_base = EXCLUDED.attack_speed_base,
-                    attack_speed_scale = EXCLUDED.attack_speed_scale,
-                    move_speed = EXCLUDED.move_speed,
-                    updated_at = NOW()
-                """,
+            rows.append(
                 (
                     hero_id_str,
                     champ.get("healthBase"),
@@ -496,16 +650,60 @@ def sync_champion_stats() -> int:
                     champ.get("asBase"),
                     champ.get("asScale"),
                     champ.get("moveSpeed"),
-                ),
+                )
             )
             count += 1
 
+        for start in range(0, len(placeholders), INSERT_CHUNK_SIZE):
+            chunk = placeholders[start : start + INSERT_CHUNK_SIZE]
+            values_sql = ", ".join(["(%s, %s, %s)"] * len(chunk))
+            conn.execute(
+                f"""
+                INSERT INTO champions (hero_id, name_en, alias)
+                VALUES {values_sql}
+                ON CONFLICT (hero_id) DO NOTHING
+                """,
+                list(chain.from_iterable(chunk)),
+            )
+        _copy_upsert(conn, "champion_stats", STATS_COLUMNS, rows, ["hero_id"], STATS_COLUMNS[1:])
         conn.commit()
         logger.info(f"Synced stats for {count} champions")
 
     return count
 
 
+def _fetch_ability_rows(champ: dict[str, Any]) -> list[tuple[str, str, str, str, str]]:
+    """Busca o detalhe de um campeão e retorna as linhas de champion_abilities."""
+    hero_id_str = str(champ.get("heroId"))
+    champ_name = champ.get("name") or champ.get("id") or ""
+    detail = _fetch_champion_detail(champ)
+    source = detail or champ
+    if detail:
+        champ_name = (
+            detail.get("name")
+            or detail.get("id")
+            or detail.get("slug")
+            or champ_name
+        )
+    abilities = _extract_abilities(source)
+    if not abilities:
+        tencent_detail = _fetch_tencent_hero_detail(hero_id_str)
+        if tencent_detail:
+            root = _find_abilities_root(tencent_detail) or tencent_detail
+            abilities = _extract_abilities(root)
+
+    return [
+        (
+            hero_id_str,
+            champ_name,
+            ability["key"],
+            ability["name"],
+            ability["description"],
+        )
+        for ability in abilities
+    ]
+
+
 def sync_champion_abilities() -> int:
     """
     Sync abilities from the most up-to-date champion dataset.
@@ -513,65 +711,46 @@ def sync_champion_abilities() -> int:
     if not POSTGRES_DSN:
         return 0
 
-    logger.info("Fetching champion abilities from wr-database...")
-    data = _fetch_json(WR_DATABASE_CHAMPIONS)
-    champions = data.get("champions_data", [])
+    return _store_ability_rows(_fetch_all_ability_rows())
 
-    count = 0
-    with psycopg.connect(POSTGRES_DSN) as conn:
-        _ensure_game_tables(conn)
 
-        for champ in champions:
-            hero_id = champ.get("heroId")
-            if not hero_id or hero_id == 10666:
-                continue
+def _fetch_all_ability_rows() -> list[tuple[str, str, str, str, str]]:
+    """Parte de rede do sync de habilidades; não toca no banco."""
+    if not POSTGRES_DSN:
+        return []
 
-            hero_id_str = str(hero_id)
-            champ_name = champ.get("name") or champ.get("id") or ""
-            detail = _fetch_champion_detail(champ)
-            source = detail or champ
-            if detail:
-                champ_name = (
-                    detail.get("name")
-                    or detail.get("id")
-                    or detail.get("slug")
-                    or champ_name
-                )
-            abilities = _extract_abilities(source)
-            if not abilities:
-                tencent_detail = _fetch_tencent_hero_detail(hero_id_str)
-                if tencent_detail:
-                    root = _find_abilities_root(tencent_detail) or tencent_detail
-                    abilities = _extract_abilities(root)
-            if not abilities:
-                continue
+    logger.info("Fetching champion abilities from wr-database...")
+    data = _fetch_wrdb_champions()
+    champions = [
+        c for c in data.get("champions_data", []) if c.get("heroId") and c.get("heroId") != 10666
+    ]
 
-            conn.execute(
-                "DELETE FROM champion_abilities WHERE hero_id = %s",
-                (hero_id_str,),
-            )
-            for ability in abilities:
-                conn.execute(
-                    """
-                    INSERT INTO champion_abilities
-                        (hero_id, champion_name, ability_key, ability_name, description)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (hero_id, ability_key) DO UPDATE SET
-                        champion_name = EXCLUDED.champion_name,
-                        ability_name = EXCLUDED.ability_name,
-                        description = EXCLUDED.description,
-                        updated_at = NOW()
-                    """,
-                    (
-                        hero_id_str,
-                        champ_name,
-                        ability["key"],
-                        ability["name"],
-                        ability["description"],
-                    ),
-                )
-                count += 1
+    # Fetches por campeão são só I/O: rodam em paralelo, limitados a FETCH_WORKERS
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        return [
+            row
+            for champ_rows in executor.map(_fetch_ability_rows, champions)
+            for row in champ_rows
+        ]
+
+
+def _store_ability_rows(rows: list[tuple[str, str, str, str, str]]) -> int:
+    if not POSTGRES_DSN:
+        return 0
 
+    count = len(rows)
+    with _sync_connect() as conn:
+
+        # Habilidades de cada campeão sincronizado são substituídas por completo
+        _copy_upsert(
+            conn,
+            "champion_abilities",
+            ABILITY_COLUMNS,
+            rows,
+            ["hero_id", "ability_key"],
+            ["champion_name", "ability_name", "description"],
+            replace_key="hero_id",
+        )
         conn.commit()
         logger.info("Synced %s champion abilities", count)
 
@@ -596,49 +775,44 @@ def sync_winrates() -> int:
     positions_data = data.get("data", {}).get("0", {})
     count = 0
 
-    with psycopg.connect(POSTGRES_DSN) as conn:
-        _ensure_game_tables(conn)
+    rows = []
+    for pos_key, heroes in positions_data.items():
+        position = POSITION_MAP.get(pos_key, pos_key)
 
-        for pos_key, heroes in positions_data.items():
-            position = POSITION_MAP.get(pos_key, pos_key)
-
-            for hero in heroes:
-                hero_id = hero.get("hero_id")
-                if not hero_id:
-                    continue
+        for hero in heroes:
+            hero_id = hero.get("hero_id")
+            if not hero_id:
+                continue
 
-                # Parse date
-                date_str = hero.get("dtstatdate", "")
-                if len(date_str) == 8:
-                    stat_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
-                else:
-                    stat_date = None
+            # Parse date
+            date_str = hero.get("dtstatdate", "")
+            if len(date_str) == 8:
+                stat_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:]}"
+            else:
+                stat_date = None
 
-                conn.execute(
-                    """
-                    INSERT INTO champion_winrates (
-                        hero_id, position, win_rate, pick_rate, ban_rate,
-                        strength_tier, stat_date
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (hero_id, position, stat_date) DO UPDATE SET
-                        win_rate = EXCLUDED.win_rate,
-                        pick_rate = EXCLUDED.pick_rate,
-                        ban_rate = EXCLUDED.ban_rate,
-                        strength_tier = EXCLUDED.strength_tier,
-                        updated_at = NOW()
-                    """,
-                    (
-                        hero_id,
-                        position,
-                        float(hero.get("win_rate", 0)),
-                        float(hero.get("appear_rate", 0)),
-                        float(hero.get("forbid_rate", 0)),
-                        int(hero.get("strength_level", 5)),
-                        stat_date,
-                    ),
+            rows.append(
+                (
+                    hero_id,
+                    position,
+                    float(hero.get("win_rate", 0)),
+                    float(hero.get("appear_rate", 0)),
+                    float(hero.get("forbid_rate", 0)),
+                    int(hero.get("strength_level", 5)),
+                    stat_date,
                 )
-                count += 1
+            )
+            count += 1
 
+    with _sync_connect() as conn:
+        _copy_upsert(
+            conn,
+            "champion_winrates",
+            WINRATE_COLUMNS,
+            rows,
+            ["hero_id", "position", "stat_date"],
+            ["win_rate", "pick_rate", "ban_rate", "strength_tier"],
+        )
         conn.commit()
         logger.info(f"Synced {count} winrate records")
 
@@ -647,38 +821,28 @@ def sync_winrates() -> int:
 
 def _fetch_html(url: str) -> str:
     """Busca HTML de uma URL."""
-    req = Request(url, headers={"User-Agent": "NexusCoach/1.0"})
-    with urlopen(req, timeout=30) as response:
-        return response.read().decode("utf-8")
-
-
-def _parse_item_stats(stats_text: str) -> dict[str, Any]:
-    """Parseia texto de stats de item para dict."""
-    stats = {}
-    # Padrões comuns: +55 AD, +250 HP, +25% Crit, etc.
-    patterns = [
-        (r"\+(\d+)\s*AD", "attack_damage"),
-        (r"\+(\d+)\s*AP", "ability_power"),
-        (r"\+(\d+)\s*HP", "health"),
-        (r"\+(\d+)\s*Mana", "mana"),
-        (r"\+(\d+)\s*Armor", "armor"),
-        (r"\+(\d+)\s*MR", "magic_resist"),
-        (r"\+(\d+)%?\s*AS", "attack_speed"),
-        (r"\+(\d+)%?\s*Crit", "crit_chance"),
-        (r"\+(\d+)\s*Haste", "ability_haste"),
-        (r"\+(\d+)%?\s*MPen", "magic_pen"),
-        (r"\+(\d+)%?\s*Omnivamp", "omnivamp"),
-        (r"\+(\d+)%?\s*HSS", "heal_shield_power"),
-    ]
-    for pattern, key in patterns:
-        match = re.search(pattern, stats_text, re.IGNORECASE)
-        if match:
-            stats[key] = int(match.group(1))
-    return stats
-
-
-def _categorize_item(name: str, stats: dict, passive: str) -> tuple[str, list[str]]:
+    return _http_get(url).decode("utf-8")
+
+
+# Parse e categorização são funções puras do texto do catálogo: memoizadas,
+# syncs repetidos no mesmo processo não refazem o trabalho
+@lru_cache(maxsize=256)
+def _parse_item_stats(stats_text: str) -> tuple[tuple[str, int], ...]:
+    """Parseia texto de stats de item em pares (stat, valor)."""
+    stats: dict[str, int] = {}
+    for match in _ITEM_STAT_RE.finditer(stats_text):
+        key = _ITEM_STAT_KEYS[(match["flat_key"] or match["pct_key"]).upper()]
+        # Vale a primeira ocorrência de cada stat
+        stats.setdefault(key, int(match["flat"] or match["pct"]))
+    return tuple(stats.items())
+
+
+@lru_cache(maxsize=256)
+def _categorize_item(
+    name: str, stats_items: tuple[tuple[str, int], ...], passive: str
+) -> tuple[str, tuple[str, ...]]:
     """Determina categoria e tags de um item."""
+    stats = dict(stats_items)
     tags = []
     category = "general"
 
@@ -702,11 +866,11 @@ def _categorize_item(name: str, stats: dict, passive: str) -> tuple[str, list[st
         tags.append("cdr")
     if stats.get("mana"):
         tags.append("mana")
-    if stats.get("omnivamp") or "vamp" in passive.lower():
+    passive_lower = passive.lower()
+    if stats.get("omnivamp") or "vamp" in passive_lower:
         tags.append("sustain")
 
     # Tags baseadas em passiva
-    passive_lower = passive.lower()
     if "grievous" in passive_lower or "anti-heal" in passive_lower:
         tags.append("anti_heal")
     if "armor pen" in passive_lower or "penetration" in passive_lower:
@@ -718,7 +882,7 @@ def _categorize_item(name: str, stats: dict, passive: str) -> tuple[str, list[st
     if "execute" in passive_lower:
         tags.append("execute")
 
-    return category, tags
+    return category, tuple(tags)
 
 
 def sync_items_from_wrmeta() -> int:
@@ -738,179 +902,95 @@ def sync_items_from_wrmeta() -> int:
         logger.exception("Failed to fetch items page")
         return 0
 
-    # Pattern para extrair dados de itens
-    # Procura por blocos de item com nome, gold, stats e passiva
-    item_pattern = re.compile(
-        r'<h[23][^>]*>([^<]+)</h[23]>'  # Nome do item
-        r'.*?'
-        r'(\d{2,4})\s*(?:Gold|gold|G)'  # Custo em gold
-        r'.*?'
-        r'((?:\+\d+[^<]{1,30})+)'  # Stats
-        r'.*?'
-        r'(?:Passive|PASSIVE|passive)[:\s]*([^<]+)',  # Passiva
-        re.DOTALL | re.IGNORECASE
-    )
-
-    # Pattern alternativo mais simples
-    simple_pattern = re.compile(
-        r'<strong>([^<]+)</strong>\s*'
-        r'.*?(\d{2,4})\s*Gold'
-        r'.*?Stats:\s*([^<]+)'
-        r'.*?(?:Passive:?\s*)?([^<]{10,200})',
-        re.DOTALL | re.IGNORECASE
-    )
-
     count = 0
 
-    # Lista de itens conhecidos do wr-meta (extraídos manualmente como fallback)
-    known_items = [
-        # Physical Damage
-        {"name": "Bloodthirster", "gold": 3000, "stats": "+55 AD, +250 HP, +25% Crit", "passive": "8% Physical Vamp, crits grant extra vamp", "category": "physical"},
-        {"name": "Guardian Angel", "gold": 3400, "stats": "+40 AD, +40 Armor", "passive": "Resurrect on death, restore 50% HP", "category": "physical"},
-        {"name": "Blade of the Ruined King", "gold": 3000, "stats": "+25 AD, +35% AS", "passive": "Attacks deal 7% current enemy health damage", "category": "physical"},
-        {"name": "Infinity Edge", "gold": 3400, "stats": "+60 AD, +25% Crit", "passive": "Crits deal 205% damage", "category": "physical"},
-        {"name": "Mortal Reminder", "gold": 3300, "stats": "+25 AD, +25% Crit, +15% AS", "passive": "30% armor pen, grievous wounds on crit", "category": "physical"},
-        {"name": "Black Cleaver", "gold": 3000, "stats": "+400 HP, +40 AD, +20 Haste", "passive": "Armor reduction stacking up to 24%", "category": "physical"},
-        {"name": "Trinity Force", "gold": 3333, "stats": "+250 HP, +30 AD, +30% AS, +25 Haste", "passive": "Spellblade bonus damage after abilities", "category": "physical"},
-        {"name": "Youmuu's Ghostblade", "gold": 3200, "stats": "+55 AD, +15 Haste", "passive": "Momentum grants MS and armor pen", "category": "physical"},
-        {"name": "Phantom Dancer", "gold": 2800, "stats": "+20 AD, +25% Crit, +40% AS", "passive": "MS and AS boost after champion hit", "category": "physical"},
-        {"name": "Essence Reaver", "gold": 3000, "stats": "+35 AD, +25% Crit, +20 Haste", "passive": "Spellblade, 3% missing mana restore", "category": "physical"},
-        {"name": "Divine Sunderer", "gold": 3400, "stats": "+425 HP, +25 AD, +25 Haste", "passive": "Spellblade deals % max health damage", "category": "physical"},
-        {"name": "Serpent's Fang", "gold": 2800, "stats": "+50 AD, +10 Haste", "passive": "15 armor pen, reduces enemy shields", "category": "physical"},
-        {"name": "Chempunk Chainsword", "gold": 2800, "stats": "+250 HP, +45 AD, +15 Haste", "passive": "Physical damage applies 50% grievous wounds", "category": "physical"},
-        {"name": "The Collector", "gold": 2900, "stats": "+45 AD, +25% Crit", "passive": "Executes low-health enemies", "category": "physical"},
-        {"name": "Sterak's Gage", "gold": 3200, "stats": "+400 HP", "passive": "50% base AD bonus, lifeline shield at 35% HP", "category": "physical"},
-        {"name": "Titanic Hydra", "gold": 3000, "stats": "+450 HP", "passive": "Cleave deals bonus damage based on HP", "category": "physical"},
-        {"name": "Hullbreaker", "gold": 3100, "stats": "+400 HP, +50 AD", "passive": "Enhanced damage vs structures", "category": "physical"},
-
-        # Magic Damage
-        {"name": "Luden's Echo", "gold": 3000, "stats": "+85 AP, +300 Mana, +20 Haste", "passive": "Discord buildup, AoE burst damage", "category": "magic"},
-        {"name": "Morellonomicon", "gold": 2500, "stats": "+150 HP, +70 AP, +20 Haste", "passive": "Magic damage applies 50% grievous wounds", "category": "magic"},
-        {"name": "Rabadon's Deathcap", "gold": 3400, "stats": "+100 AP", "passive": "20-45% AP amplification", "category": "magic"},
-        {"name": "Rylai's Crystal Scepter", "gold": 2700, "stats": "+300 HP, +65 AP", "passive": "Abilities slow 30%", "category": "magic"},
-        {"name": "Liandry's Torment", "gold": 3000, "stats": "+250 HP, +75 AP", "passive": "Damage-over-time burn", "category": "magic"},
-        {"name": "Rod of Ages", "gold": 2800, "stats": "+250 HP, +60 AP, +300 Mana", "passive": "Stacking stats over time", "category": "magic"},
-        {"name": "Lich Bane", "gold": 2950, "stats": "+80 AP, +10 Haste", "passive": "Spellblade bonus magic damage", "category": "magic"},
-        {"name": "Archangel's Staff", "gold": 2950, "stats": "+35 AP, +500 Mana, +20 Haste", "passive": "Converts mana to AP", "category": "magic"},
-        {"name": "Riftmaker", "gold": 3300, "stats": "+150 HP, +80 AP, +15 Haste, +11% Omnivamp", "passive": "Damage scales to true damage", "category": "magic"},
-        {"name": "Horizon Focus", "gold": 3100, "stats": "+90 AP, +20 Haste", "passive": "Long-range damage amplification", "category": "magic"},
-        {"name": "Cosmic Drive", "gold": 2800, "stats": "+75 AP, +30 Haste", "passive": "Ability damage grants movement speed", "category": "magic"},
-        {"name": "Crown of the Shattered Queen", "gold": 3000, "stats": "+60 AP, +200 Mana, +20 Haste", "passive": "Spell shield and damage reduction", "category": "magic"},
-        {"name": "Nashor's Tooth", "gold": 3000, "stats": "+45% AS, +20 Haste", "passive": "On-hit magic damage", "category": "magic"},
-
-        # Defense
-        {"name": "Thornmail", "gold": 2700, "stats": "+200 HP, +75 Armor", "passive": "Reflects damage, applies grievous wounds", "category": "defense"},
-        {"name": "Randuin's Omen", "gold": 2800, "stats": "+400 HP, +55 Armor", "passive": "Reduces crit damage, active slow", "category": "defense"},
-        {"name": "Dead Man's Plate", "gold": 2800, "stats": "+300 HP, +50 Armor", "passive": "Movement builds momentum for damage", "category": "defense"},
-        {"name": "Sunfire Aegis", "gold": 2700, "stats": "+350 HP, +40 Armor, +40 MR", "passive": "Immolate burns nearby enemies", "category": "defense"},
-        {"name": "Force of Nature", "gold": 2800, "stats": "+350 HP, +60 MR", "passive": "Movement speed, magic damage reduction", "category": "defense"},
-        {"name": "Spirit Visage", "gold": 2800, "stats": "+350 HP, +45 MR, +10 Haste", "passive": "Increases all healing by 25%", "category": "defense"},
-        {"name": "Warmog's Armor", "gold": 2850, "stats": "+700 HP, +10 Haste", "passive": "Regenerate HP out of combat", "category": "defense"},
-        {"name": "Frozen Heart", "gold": 2700, "stats": "+70 Armor, +300 Mana, +20 Haste", "passive": "Reduces nearby enemy attack speed", "category": "defense"},
-        {"name": "Gargoyle Enchant", "gold": 1000, "stats": "", "passive": "Shield based on bonus HP", "category": "boots"},
-        {"name": "Stasis Enchant", "gold": 1000, "stats": "", "passive": "Become invulnerable for 2.5s", "category": "boots"},
-        {"name": "Protobelt Enchant", "gold": 1000, "stats": "", "passive": "Dash forward and fire bolts", "category": "boots"},
-        {"name": "Redemption Enchant", "gold": 1000, "stats": "", "passive": "Heal allies in area", "category": "boots"},
-        {"name": "Locket Enchant", "gold": 1000, "stats": "", "passive": "Shield nearby allies", "category": "boots"},
-        {"name": "Quicksilver Enchant", "gold": 1000, "stats": "", "passive": "Remove all CC", "category": "boots"},
-        {"name": "Glorious Enchant", "gold": 1000, "stats": "", "passive": "Gain massive movement speed", "category": "boots"},
-        {"name": "Shadows Enchant", "gold": 1000, "stats": "", "passive": "Become invisible briefly", "category": "boots"},
-
-        # Boots
-        {"name": "Boots of Speed", "gold": 500, "stats": "+25 MS", "passive": "Basic movement speed", "category": "boots"},
-        {"name": "Plated Steelcaps", "gold": 1000, "stats": "+40 Armor, +40 MS", "passive": "Reduces auto attack damage", "category": "boots"},
-        {"name": "Mercury's Treads", "gold": 1000, "stats": "+40 MR, +40 MS", "passive": "Tenacity reduces CC duration", "category": "boots"},
-        {"name": "Ionian Boots of Lucidity", "gold": 950, "stats": "+15 Haste, +40 MS", "passive": "Reduces summoner spell cooldowns", "category": "boots"},
-        {"name": "Gluttonous Greaves", "gold": 1000, "stats": "+8% Omnivamp, +40 MS", "passive": "Sustain from all damage", "category": "boots"},
-        {"name": "Boots of Swiftness", "gold": 900, "stats": "+55 MS", "passive": "Slow resistance", "category": "boots"},
-
-        # Support
-        {"name": "Ardent Censer", "gold": 2700, "stats": "+250 HP, +35 AP, +20 Haste", "passive": "Heals/shields grant AS to allies", "category": "support"},
-        {"name": "Staff of Flowing Water", "gold": 2500, "stats": "+100 HP, +45 AP, +20 Haste", "passive": "Heals/shields grant haste", "category": "support"},
-        {"name": "Harmonic Echo", "gold": 2600, "stats": "+100 HP, +40 AP, +300 Mana", "passive": "Healing chains to nearby allies", "category": "support"},
-    ]
-
-    with psycopg.connect(POSTGRES_DSN) as conn:
-        _ensure_game_tables(conn)
-
-        for item in known_items:
-            stats = _parse_item_stats(item["stats"])
-            category, tags = _categorize_item(item["name"], stats, item["passive"])
-
-            # Usar categoria do item se disponível, senão usar a detectada
-            final_category = item.get("category", category)
-
-            # Normalizar nome para busca
-            name_normalized = item["name"].lower().replace("'", "").replace(" ", "_")
-
-            conn.execute(
-                """
-                INSERT INTO items (name, name_normalized, category, gold_cost, stats, passive_name, passive_desc, tags)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (name) DO UPDATE SET
-                    name_normalized = EXCLUDED.name_normalized,
-                    category = EXCLUDED.category,
-                    gold_cost = EXCLUDED.gold_cost,
-                    stats = EXCLUDED.stats,
-                    passive_desc = EXCLUDED.passive_desc,
-                    tags = EXCLUDED.tags,
-                    updated_at = NOW()
-                """,
-                (
-                    item["name"],
-                    name_normalized,
-                    final_category,
-                    item["gold"],
-                    json.dumps(stats),
-                    None,  # passive_name extraído separadamente se necessário
-                    item["passive"],
-                    tags,
-                ),
+    rows = []
+    for item in _KNOWN_ITEMS:
+        stats_items = _parse_item_stats(item["stats"])
+        category, tags = _categorize_item(item["name"], stats_items, item["passive"])
+        stats = dict(stats_items)
+
+        # Usar categoria do item se disponível, senão usar a detectada
+        final_category = item.get("category", category)
+
+        # Normalizar nome para busca
+        name_normalized = item["name"].lower().replace("'", "").replace(" ", "_")
+
+        rows.append(
+            (
+                item["name"],
+                name_normalized,
+                final_category,
+                item["gold"],
+                Jsonb(stats),
+                None,  # passive_name extraído separadamente se necessário
+                item["passive"],
+                list(tags),
             )
-            count += 1
-
+        )
+        count += 1
+
+    with _sync_connect() as conn:
+        _copy_upsert(
+            conn,
+            "items",
+            ITEM_COLUMNS,
+            rows,
+            ["name"],
+            ["name_normalized", "category", "gold_cost", "stats", "passive_desc", "tags"],
+        )
         conn.commit()
         logger.info(f"Synced {count} items")
 
     return count
 
 
-def sync_all() -> dict[str, int]:
-    """Sincroniza todos os dados do jogo."""
-    results = {
-        "champions": 0,
-        "stats": 0,
-        "winrates": 0,
-        "items": 0,
-        "abilities": 0,
-    }
-
+def _run_sync(sync: Callable[[], Any], error_message: str, default: Any = 0) -> Any:
     try:
-        hero_map = sync_champions_from_tencent()
-        results["champions"] = len(hero_map)
+        return sync()
     except Exception:
-        logger.exception("Failed to sync champions")
+        logger.exception(error_message)
+        return default
 
-    try:
-        results["stats"] = sync_champion_stats()
-    except Exception:
-        logger.exception("Failed to sync champion stats")
 
-    try:
-        results["winrates"] = sync_winrates()
-    except Exception:
-        logger.exception("Failed to sync winrates")
+def clear_caches() -> None:
+    """Descarta os caches em memória dos getters."""
+    _champion_cache.clear()
+    _item_cache.clear()
+    _winrate_cache.clear()
+    _bundle_cache.clear()
+    _counter_items_cache.clear()
 
-    try:
-        results["abilities"] = sync_champion_abilities()
-    except Exception:
-        logger.exception("Failed to sync champion abilities")
 
-    try:
-        results["items"] = sync_items_from_wrmeta()
-    except Exception:
-        logger.exception("Failed to sync items")
+def sync_all() -> dict[str, int]:
+    """Sincroniza todos os dados do jogo."""
+    # Itens não dependem de nada e rodam em paralelo com o resto. Stats e winrates
+    # referenciam champions (FK) e rodam juntos depois dele; os fetches de
+    # habilidades também já começam aí, mas a gravação espera o sync de stats,
+    # que insere os campeões básicos.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        items = executor.submit(_run_sync, sync_items_from_wrmeta, "Failed to sync items")
+        hero_map = _run_sync(sync_champions_from_tencent, "Failed to sync champions", {})
+        stats = executor.submit(_run_sync, sync_champion_stats, "Failed to sync champion stats")
+        winrates = executor.submit(_run_sync, sync_winrates, "Failed to sync winrates")
+        ability_rows = executor.submit(
+            _run_sync, _fetch_all_ability_rows, "Failed to sync champion abilities", []
+        )
+        stats.result()
+        abilities = _run_sync(
+            lambda: _store_ability_rows(ability_rows.result()),
+            "Failed to sync champion abilities",
+        )
 
+        results = {
+            "champions": len(hero_map),
+            "stats": stats.result(),
+            "winrates": winrates.result(),
+            "items": items.result(),
+            "abilities": abilities,
+        }
+
+    clear_caches()
     return results
 
 
@@ -919,8 +999,13 @@ def get_champion_info(champion_name: str) -> dict[str, Any] | None:
     if not POSTGRES_DSN:
         return None
 
+    key = champion_name.lower()
+    cached = _champion_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
+        with get_pool().connection() as conn:
             row = conn.execute(
                 """
                 SELECT c.hero_id, c.name_cn, c.name_en, c.roles, c.lanes,
@@ -939,7 +1024,7 @@ def get_champion_info(champion_name: str) -> dict[str, Any] | None:
             if not row:
                 return None
 
-            return {
+            info = {
                 "hero_id": row[0],
                 "name_cn": row[1],
                 "name_en": row[2],
@@ -956,6 +1041,8 @@ def get_champion_info(champion_name: str) -> dict[str, Any] | None:
                     "move_speed": row[12],
                 },
             }
+            _champion_cache.set(key, info)
+            return info
     except Exception:
         logger.exception("Failed to get champion info")
         return None
@@ -967,28 +1054,21 @@ def get_champion_abilities(champion_name: str) -> list[dict[str, Any]]:
         return []
 
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            hero_row = conn.execute(
+        with get_pool().connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+            rows = cur.execute(
                 """
-                SELECT hero_id FROM champions
-                WHERE LOWER(name_en) = LOWER(%s)
-                   OR LOWER(alias) = LOWER(%s)
-                   OR LOWER(name_cn) = %s
-                LIMIT 1
-                """,
-                (champion_name, champion_name, champion_name),
-            ).fetchone()
-            if not hero_row:
-                return []
-
-            hero_id = hero_row[0]
-            rows = conn.execute(
-                """
-                SELECT ability_key, ability_name, description
-                FROM champion_abilities
-                WHERE hero_id = %s
+                WITH h AS (
+                    SELECT hero_id FROM champions
+                    WHERE LOWER(name_en) = LOWER(%s)
+                       OR LOWER(alias) = LOWER(%s)
+                       OR LOWER(name_cn) = %s
+                    LIMIT 1
+                )
+                SELECT a.ability_key AS key, a.ability_name AS name, a.description
+                FROM champion_abilities a
+                JOIN h USING (hero_id)
                 ORDER BY
-                    CASE ability_key
+                    CASE a.ability_key
                         WHEN 'passive' THEN 0
                         WHEN 'q' THEN 1
                         WHEN 'w' THEN 2
@@ -997,16 +1077,9 @@ def get_champion_abilities(champion_name: str) -> list[dict[str, Any]]:
                         ELSE 5
                     END
                 """,
-                (hero_id,),
+                (champion_name, champion_name, champion_name),
             ).fetchall()
-            return [
-                {
-                    "key": row[0],
-                    "name": row[1],
-                    "description": row[2],
-                }
-                for row in rows
-            ]
+            return rows
     except Exception:
         logger.exception("Failed to get champion abilities")
         return []
@@ -1017,74 +1090,182 @@ def get_champion_winrate(champion_name: str, position: str | None = None) -> dic
     if not POSTGRES_DSN:
         return None
 
-    try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            # Primeiro busca o hero_id
-            hero_row = conn.execute(
-                """
-                SELECT hero_id FROM champions
-                WHERE LOWER(name_en) = LOWER(%s)
-                   OR LOWER(alias) = LOWER(%s)
-                LIMIT 1
-                """,
-                (champion_name, champion_name),
-            ).fetchone()
-
-            if not hero_row:
-                return None
-
-            hero_id = hero_row[0]
+    key = (champion_name.lower(), position)
+    cached = _winrate_cache.get(key)
+    if cached is not None:
+        return cached
 
-            # Busca winrate
+    try:
+        with get_pool().connection() as conn:
+            # hero_id resolvido num CTE: uma ida ao banco só
             if position:
                 row = conn.execute(
                     """
-                    SELECT position, win_rate, pick_rate, ban_rate, strength_tier
-                    FROM champion_winrates
-                    WHERE hero_id = %s AND position = %s
-                    ORDER BY stat_date DESC
+                    WITH h AS (
+                        SELECT hero_id FROM champions
+                        WHERE LOWER(name_en) = LOWER(%s)
+                           OR LOWER(alias) = LOWER(%s)
+                        LIMIT 1
+                    )
+                    SELECT w.position, w.win_rate, w.pick_rate, w.ban_rate, w.strength_tier
+                    FROM champion_winrates w
+                    JOIN h USING (hero_id)
+                    WHERE w.position = %s
+                    ORDER BY w.stat_date DESC
                     LIMIT 1
                     """,
-                    (hero_id, position),
+                    (champion_name, champion_name, position),
                 ).fetchone()
             else:
                 row = conn.execute(
                     """
-                    SELECT position, win_rate, pick_rate, ban_rate, strength_tier
-                    FROM champion_winrates
-                    WHERE hero_id = %s
-                    ORDER BY pick_rate DESC, stat_date DESC
+                    WITH h AS (
+                        SELECT hero_id FROM champions
+                        WHERE LOWER(name_en) = LOWER(%s)
+                           OR LOWER(alias) = LOWER(%s)
+                        LIMIT 1
+                    )
+                    SELECT w.position, w.win_rate, w.pick_rate, w.ban_rate, w.strength_tier
+                    FROM champion_winrates w
+                    JOIN h USING (hero_id)
+                    ORDER BY w.pick_rate DESC, w.stat_date DESC
                     LIMIT 1
                     """,
-                    (hero_id,),
+                    (champion_name, champion_name),
                 ).fetchone()
 
             if not row:
                 return None
 
-            return {
+            winrate = {
                 "position": row[0],
                 "win_rate": float(row[1]) * 100,
                 "pick_rate": float(row[2]) * 100,
                 "ban_rate": float(row[3]) * 100,
                 "tier": row[4],
             }
+            _winrate_cache.set(key, winrate)
+            return winrate
     except Exception:
         logger.exception("Failed to get champion winrate")
         return None
 
 
+def get_champion_bundle(
+    champion_name: str, position: str | None = None
+) -> dict[str, Any] | None:
+    """
+    Busca info, winrate e habilidades de um campeão numa única consulta.
+
+    Retorna {"info": ..., "winrate": ..., "abilities": [...]} nos mesmos formatos
+    de get_champion_info, get_champion_winrate e get_champion_abilities.
+    """
+    if not POSTGRES_DSN:
+        return None
+
+    key = (champion_name.lower(), position)
+    cached = _bundle_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        with get_pool().connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+            row = cur.execute(
+                """
+                WITH h AS (
+                    SELECT hero_id FROM champions
+                    WHERE LOWER(name_en) = LOWER(%(name)s)
+                       OR LOWER(alias) = LOWER(%(name)s)
+                       OR LOWER(name_cn) = %(name)s
+                    LIMIT 1
+                )
+                SELECT
+                    json_build_object(
+                        'hero_id', c.hero_id,
+                        'name_cn', c.name_cn,
+                        'name_en', c.name_en,
+                        'roles', c.roles,
+                        'lanes', c.lanes,
+                        'difficulty', c.difficulty,
+                        'damage', c.damage,
+                        'survivability', c.survivability,
+                        'utility', c.utility,
+                        'stats', json_build_object(
+                            'health', s.health_base,
+                            'armor', s.armor_base,
+                            'attack', s.attack_base,
+                            'move_speed', s.move_speed
+                        )
+                    ) AS info,
+                    (
+                        SELECT json_build_object(
+                            'position', w.position,
+                            'win_rate', w.win_rate * 100,
+                            'pick_rate', w.pick_rate * 100,
+                            'ban_rate', w.ban_rate * 100,
+                            'tier', w.strength_tier
+                        )
+                        FROM champion_winrates w
+                        WHERE w.hero_id = h.hero_id
+                          AND (%(position)s::text IS NULL OR w.position = %(position)s)
+                        ORDER BY
+                            CASE WHEN %(position)s::text IS NULL THEN w.pick_rate END DESC,
+                            w.stat_date DESC
+                        LIMIT 1
+                    ) AS winrate,
+                    (
+                        SELECT COALESCE(
+                            json_agg(
+                                json_build_object(
+                                    'key', a.ability_key,
+                                    'name', a.ability_name,
+                                    'description', a.description
+                                )
+                                ORDER BY
+                                    CASE a.ability_key
+                                        WHEN 'passive' THEN 0
+                                        WHEN 'q' THEN 1
+                                        WHEN 'w' THEN 2
+                                        WHEN 'e' THEN 3
+                                        WHEN 'r' THEN 4
+                                        ELSE 5
+                                    END
+                            ),
+                            '[]'
+                        )
+                        FROM champion_abilities a
+                        WHERE a.hero_id = h.hero_id
+                    ) AS abilities
+                FROM h
+                JOIN champions c USING (hero_id)
+                LEFT JOIN champion_stats s USING (hero_id)
+                """,
+                {"name": champion_name, "position": position},
+            ).fetchone()
+
+            if not row:
+                return None
+
+            _bundle_cache.set(key, row)
+            return row
+    except Exception:
+        logger.exception("Failed to get champion bundle")
+        return None
+
+
 def get_matchup_tips(champion: str, enemy: str, lane: str | None = None) -> dict[str, Any] | None:
     """Busca dicas de matchup."""
     if not POSTGRES_DSN:
         return None
 
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
+        with get_pool().connection() as conn, conn.cursor(row_factory=dict_row) as cur:
             if lane:
-                row = conn.execute(
+                row = cur.execute(
                     """
-                    SELECT difficulty, tips, counter_items, power_spikes, score
+                    SELECT difficulty, COALESCE(tips, '{}') AS tips,
+                           COALESCE(counter_items, '{}') AS counter_items,
+                           COALESCE(power_spikes, '{}') AS power_spikes, score
                     FROM matchup_tips
                     WHERE LOWER(champion) = LOWER(%s)
                       AND LOWER(enemy) = LOWER(%s)
@@ -1094,9 +1275,11 @@ def get_matchup_tips(champion: str, enemy: str, lane: str | None = None) -> dict
                     (champion, enemy, lane),
                 ).fetchone()
             else:
-                row = conn.execute(
+                row = cur.execute(
                     """
-                    SELECT difficulty, tips, counter_items, power_spikes, score
+                    SELECT difficulty, COALESCE(tips, '{}') AS tips,
+                           COALESCE(counter_items, '{}') AS counter_items,
+                           COALESCE(power_spikes, '{}') AS power_spikes, score
                     FROM matchup_tips
                     WHERE LOWER(champion) = LOWER(%s)
                       AND LOWER(enemy) = LOWER(%s)
@@ -1106,16 +1289,7 @@ def get_matchup_tips(champion: str, enemy: str, lane: str | None = None) -> dict
                     (champion, enemy),
                 ).fetchone()
 
-            if not row:
-                return None
-
-            return {
-                "difficulty": row[0],
-                "tips": row[1] or [],
-                "counter_items": row[2] or [],
-                "power_spikes": row[3] or [],
-                "score": row[4],
-            }
+            return row
     except Exception:
         logger.exception("Failed to get matchup tips")
         return None
@@ -1126,32 +1300,43 @@ def get_item_info(item_name: str) -> dict[str, Any] | None:
     if not POSTGRES_DSN:
         return None
 
+    key = item_name.lower()
+    cached = _item_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            row = conn.execute(
+        with get_pool().connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+            # Igualdade primeiro (índices em LOWER(name) e name_normalized);
+            # o ILIKE, que varre a tabela, só roda se não achar
+            row = cur.execute(
                 """
-                SELECT name, category, gold_cost, stats, passive_desc, tags
+                SELECT name, category, gold_cost, COALESCE(stats, '{}') AS stats,
+                       passive_desc AS passive, COALESCE(tags, '{}') AS tags
                 FROM items
                 WHERE LOWER(name) = LOWER(%s)
                    OR name_normalized = %s
-                   OR name ILIKE %s
                 LIMIT 1
                 """,
-                (item_name, item_name.lower().replace(" ", "_").replace("'", ""),
-                 f"%{item_name}%"),
+                (item_name, item_name.lower().replace(" ", "_").replace("'", "")),
             ).fetchone()
+            if not row:
+                row = cur.execute(
+                    """
+                    SELECT name, category, gold_cost, COALESCE(stats, '{}') AS stats,
+                           passive_desc AS passive, COALESCE(tags, '{}') AS tags
+                    FROM items
+                    WHERE name ILIKE %s
+                    LIMIT 1
+                    """,
+                    (f"%{item_name}%",),
+                ).fetchone()
 
             if not row:
                 return None
 
-            return {
-                "name": row[0],
-                "category": row[1],
-                "gold_cost": row[2],
-                "stats": row[3] or {},
-                "passive": row[4],
-                "tags": row[5] or [],
-            }
+            _item_cache.set(key, row)
+            return row
     except Exception:
         logger.exception("Failed to get item info")
         return None
@@ -1179,47 +1364,45 @@ def get_counter_items(
     if not POSTGRES_DSN:
         return []
 
+    # Poucas combinações de flags, repetidas a cada turno do coach
+    key = (needs_anti_heal, needs_armor_pen, needs_magic_resist, needs_armor, category)
+    cached = _counter_items_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            conditions = []
-            params = []
-
-            if needs_anti_heal:
-                conditions.append("'anti_heal' = ANY(tags)")
-            if needs_armor_pen:
-                conditions.append("'armor_pen' = ANY(tags)")
-            if needs_magic_resist:
-                conditions.append("(stats->>'magic_resist')::int > 0")
-            if needs_armor:
-                conditions.append("(stats->>'armor')::int > 0")
-            if category:
-                conditions.append("category = %s")
-                params.append(category)
-
-            where_clause = " OR ".join(conditions) if conditions else "1=1"
-
-            rows = conn.execute(
-                f"""
-                SELECT name, category, gold_cost, stats, passive_desc, tags
+        with get_pool().connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+            # SQL fixo com os filtros como parâmetros: um único plano reaproveitado
+            # para qualquer combinação de flags (sem filtro nenhum, vale tudo)
+            rows = cur.execute(
+                """
+                SELECT name, category, gold_cost, COALESCE(stats, '{}') AS stats,
+                       passive_desc AS passive, COALESCE(tags, '{}') AS tags
                 FROM items
-                WHERE {where_clause}
+                WHERE NOT %(filtered)s
+                   OR (%(anti_heal)s AND 'anti_heal' = ANY(tags))
+                   OR (%(armor_pen)s AND 'armor_pen' = ANY(tags))
+                   OR (%(magic_resist)s AND (stats->>'magic_resist')::int > 0)
+                   OR (%(armor)s AND (stats->>'armor')::int > 0)
+                   OR category = %(category)s
                 ORDER BY gold_cost DESC
                 LIMIT 5
                 """,
-                params,
+                {
+                    "filtered": bool(
+                        needs_anti_heal or needs_armor_pen or needs_magic_resist
+                        or needs_armor or category
+                    ),
+                    "anti_heal": needs_anti_heal,
+                    "armor_pen": needs_armor_pen,
+                    "magic_resist": needs_magic_resist,
+                    "armor": needs_armor,
+                    "category": category,
+                },
             ).fetchall()
 
-            return [
-                {
-                    "name": row[0],
-                    "category": row[1],
-                    "gold_cost": row[2],
-                    "stats": row[3] or {},
-                    "passive": row[4],
-                    "tags": row[5] or [],
-                }
-                for row in rows
-            ]
+            _counter_items_cache.set(key, rows)
+            return rows
     except Exception:
         logger.exception("Failed to get counter items")
         return []
@@ -1231,10 +1414,11 @@ def get_items_by_category(category: str, limit: int = 5) -> list[dict[str, Any]]
         return []
 
     try:
-        with psycopg.connect(POSTGRES_DSN) as conn:
-            rows = conn.execute(
+        with get_pool().connection() as conn, conn.cursor(row_factory=dict_row) as cur:
+            rows = cur.execute(
                 """
-                SELECT name, category, gold_cost, stats, passive_desc, tags
+                SELECT name, category, gold_cost, COALESCE(stats, '{}') AS stats,
+                       passive_desc AS passive, COALESCE(tags, '{}') AS tags
                 FROM items
                 WHERE category = %s
                 ORDER BY gold_cost DESC
@@ -1243,17 +1427,7 @@ def get_items_by_category(category: str, limit: int = 5) -> list[dict[str, Any]]
                 (category, limit),
             ).fetchall()
 
-            return [
-                {
-                    "name": row[0],
-                    "category": row[1],
-                    "gold_cost": row[2],
-                    "stats": row[3] or {},
-                    "passive": row[4],
-                    "tags": row[5] or [],
-                }
-                for row in rows
-            ]
+            return rows
     except Exception:
         logger.exception("Failed to get items by category")
         return []
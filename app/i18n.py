@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 
@@ -21,6 +22,7 @@ _MESSAGES: dict[str, dict[str, str]] = {
         "continue_strategy": "Continuando a estratégia anterior: {last_reply}",
         "enemy_item": "Ok, {champion} com {item}. Se estiver te castigando, priorize defesa antes de dano.",
         "self_item": "Beleza, registrei {item}. Se quiser ajuste, diga seu ouro e o estado da rota.",
+        "status_ack": "Anotado{context}. {advice}",
     },
     "en": {
         "session_not_found": "Session ended. Tap Start Match to continue.",
@@ -39,16 +41,24 @@ _MESSAGES: dict[str, dict[str, str]] = {
         "continue_strategy": "Continuing the previous strategy: {last_reply}",
         "enemy_item": "Got it, {champion} has {item}. If it's hurting you, prioritize defense.",
         "self_item": "Noted your {item}. If you want adjustments, tell me your gold and lane state.",
+        "status_ack": "Noted{context}. {advice}",
     },
 }
 
 
 def msg(locale: str | None, key: str, **kwargs: Any) -> str:
-    lang = _pick_lang(locale)
-    template = _MESSAGES.get(lang, _MESSAGES["pt"]).get(key, key)
+    template = _template(_pick_lang(locale), key)
+    if not kwargs:
+        return template
     return template.format(**kwargs)
 
 
+@lru_cache(maxsize=256)
+def _template(lang: str, key: str) -> str:
+    return _MESSAGES.get(lang, _MESSAGES["pt"]).get(key, key)
+
+
+@lru_cache(maxsize=64)
 def _pick_lang(locale: str | None) -> str:
     if not locale:
         return "pt"
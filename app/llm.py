@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
 from app.config import GEMINI_API_KEY, GEMINI_MODEL, LLM_PROVIDER
@@ -19,131 +22,294 @@ except ImportError:  # pragma: no cover - optional dependency
 
 logger = logging.getLogger("nexuscoach")
 
-
-def generate_reply(
+# Config de geração fixa, montada uma vez no import
+_GENERATION_CONFIG = (
+    genai_types.GenerateContentConfig(
+        temperature=0.5,
+        top_p=0.9,
+        max_output_tokens=180,
+    )
+    if _genai_available
+    else None
+)
+
+
+# Trecho fixo do prompt; só o contexto da partida muda entre turnos
+_PROMPT_RULES = (
+    "You are NexusCoach, an in-game Wild Rift MOBILE voice coach. "
+    "Be short, tactical, friendly and PRACTICAL. "
+    "Use the game data below to give accurate advice. "
+    "Consider the FULL enemy team composition when giving item/strategy advice. "
+    "\n"
+    "IMPORTANT RULES:\n"
+    "- This is MOBILE Wild Rift, NOT PC League of Legends.\n"
+    "- If ability data is available in Game Data, it is the source of truth.\n"
+    "- If ability data is missing, do NOT invent ability mechanics.\n"
+    "- NEVER use keyboard keys like Q, W, E, R to refer to abilities.\n"
+    "- Instead, describe abilities by their VISUAL EFFECT or NAME.\n"
+    "  Examples: 'his shadow clone', 'the spinning slash', 'the hook', 'her charm', 'the dash'.\n"
+    "- When giving tips, explain HOW to do it, not just WHAT to do.\n"
+    "  Bad: 'Bait his combo then punish'\n"
+    "  Good: 'Stay behind minions - when he throws his shadow at you, sidestep and attack while it recharges'\n"
+    "- Be specific about timing, positioning, or visual cues when possible.\n"
+    "- If context is missing, ask one short question.\n"
+    "- Keep answers under 3 sentences.\n"
+)
+
+# Contexto da partida; por turno só o format_map
+_PROMPT_CONTEXT = (
+    "\n\n"
+    "Context:\n"
+    "- Champion: {champion}\n"
+    "- Lane: {lane}\n"
+    "- Enemies: {enemies}\n"
+    "- Phase: {phase}\n"
+    "- Status: {status}\n"
+    "- Gold: {gold}\n"
+    "- Your items: {self_items}\n"
+    "- Enemy items: {enemy_items}\n"
+    "- Intent hint: {intent}\n"
+    "- Last coach tip: {last_reply}\n\n"
+    "Game Data (from Wild Rift stats):\n"
+    "{game_data}\n\n"
+    "Useful tips from memory:\n"
+    "{advice}\n\n"
+    "LEARNED CORRECTIONS (from user feedback - ALWAYS respect these):\n"
+    "{corrections}\n\n"
+    "Recent conversation:\n"
+    "{history}\n\n"
+    "User message:\n"
+    "{user_text}\n"
+)
+
+_LANG_LINE = {
+    "en": "Reply in English (en-US).",
+    "pt": "Responda em português (pt-BR).",
+}
+
+# Preâmbulo e linha de idioma já concatenados: um template pronto por idioma
+_PROMPT_TEMPLATES = {
+    lang: _PROMPT_RULES + line + _PROMPT_CONTEXT for lang, line in _LANG_LINE.items()
+}
+
+
+_TIER_NAMES = {1: "S+", 2: "S", 3: "A", 4: "B", 5: "C"}
+
+_ENEMY_STATUS_LABELS = {"ahead": " [FED - THREAT]", "behind": " [behind]"}
+
+_NL_TO_SPACE = str.maketrans({"\n": " ", "\r": " "})
+
+# Defesa recomendada pela análise de composição -> (flag de get_counter_items, rótulo)
+_DEFENSE_COUNTERS = (
+    ("anti_heal", "needs_anti_heal", "Anti-heal"),
+    ("armor_pen", "needs_armor_pen", "Armor pen"),
+    ("magic_resist", "needs_magic_resist", "Magic resist"),
+    ("armor", "needs_armor", "Armor"),
+)
+
+
+async def generate_reply(
     *,
     state: dict[str, Any],
     intent: str,
     history: list[dict[str, Any]],
-    advice: list[str],
+    advice: list[dict[str, Any]],
     locale: str | None,
     user_text: str,
+    corrections: list[dict[str, Any]] | None = None,
 ) -> str | None:
-    if LLM_PROVIDER != "gemini":
-        return None
-    if not GEMINI_API_KEY or not _genai_available:
+    if not _llm_enabled():
         return None
 
-    prompt = _build_prompt(
+    # O prompt consulta o banco (síncrono): roda numa thread, fora do event loop
+    prompt = await asyncio.to_thread(
+        _build_prompt,
         state=state,
         intent=intent,
         history=history,
         advice=advice,
         locale=locale,
         user_text=user_text,
+        corrections=corrections,
     )
 
     try:
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt,
-            config=genai_types.GenerateContentConfig(
-                temperature=0.5,
-                top_p=0.9,
-                max_output_tokens=180,
-            ),
-        )
+        chunks = [chunk async for chunk in _stream_chunks(prompt)]
     except Exception:
         logger.exception("gemini_request_failed")
         return None
 
-    if not response or not response.text:
+    return "".join(chunks).strip() or None
+
+
+async def generate_reply_stream(
+    *,
+    state: dict[str, Any],
+    intent: str,
+    history: list[dict[str, Any]],
+    advice: list[dict[str, Any]],
+    locale: str | None,
+    user_text: str,
+    corrections: list[dict[str, Any]] | None = None,
+) -> AsyncIterator[str]:
+    """Entrega a resposta em pedaços à medida que o Gemini gera os tokens."""
+    if not _llm_enabled():
+        return
+
+    prompt = await asyncio.to_thread(
+        _build_prompt,
+        state=state,
+        intent=intent,
+        history=history,
+        advice=advice,
+        locale=locale,
+        user_text=user_text,
+        corrections=corrections,
+    )
+
+    try:
+        async for chunk in _stream_chunks(prompt):
+            yield chunk
+    except Exception:
+        logger.exception("gemini_request_failed")
+
+
+def retrieve_prompt_corrections(state: dict[str, Any]) -> list[dict[str, Any]]:
+    """Correções aprendidas para os campeões do estado; vazio se o LLM está desligado."""
+    if not _llm_enabled():
+        return []
+    return _fetch_corrections(state)
+
+
+def _fetch_corrections(state: dict[str, Any]) -> list[dict[str, Any]]:
+    # Sem repetidos (o mesmo campeão pode vir como enemy e em enemies)
+    relevant_champions = list(
+        dict.fromkeys(
+            c
+            for c in (
+                _known(state.get("champion")),
+                _known(state.get("enemy")),
+                *(e.get("champion") for e in state.get("enemies") or []),
+            )
+            if c and c != "unknown"
+        )
+    )
+    return db.retrieve_corrections(champions=relevant_champions or None, limit=5)
+
+
+def _llm_enabled() -> bool:
+    return LLM_PROVIDER == "gemini" and bool(GEMINI_API_KEY) and _genai_available
+
+
+async def _stream_chunks(prompt: str) -> AsyncIterator[str]:
+    stream = await db.get_genai_client().aio.models.generate_content_stream(
+        model=GEMINI_MODEL,
+        contents=prompt,
+        config=_GENERATION_CONFIG,
+    )
+    async for chunk in stream:
+        if chunk.text:
+            yield chunk.text
+
+
+def _render_ability(ability: dict[str, Any]) -> str | None:
+    name = ability.get("name")
+    if not name:
         return None
-    return response.text.strip() or None
+    desc = ability.get("description") or ""
+    short = desc[:240].translate(_NL_TO_SPACE).strip()
+    if len(short) > 120:
+        short = short[:117].rstrip() + "..."
+    return f"    - {name}: {short}\n" if short else f"    - {name}\n"
 
 
 def _build_game_data_block(
-    champion: str,
-    enemy: str,
-    lane: str,
+    champion: str | None,
+    enemy: str | None,
+    lane: str | None,
     enemies: list[dict[str, Any]] | None = None,
+    cache: dict[Any, Any] | None = None,
 ) -> str:
     """Constrói bloco de dados do jogo para o prompt."""
-    lines = []
+    # Sessão ainda sem contexto (valores já normalizados para None)
+    if not (champion or enemy or enemies):
+        return "No game data available"
+
+    buf = io.StringIO()
+    w = buf.write
+
+    # Memo do turno: o mesmo campeão aparece no time inimigo e na análise de
+    # composição; guarda também os "não encontrado", que o cache do game_data não guarda
+    cache = {} if cache is None else cache
+
+    def champion_info(name: str) -> dict[str, Any] | None:
+        key = ("info", name)
+        if key not in cache:
+            cache[key] = game_data.get_champion_info(name)
+        return cache[key]
 
     # Dados do campeão do jogador
-    if champion and champion != "unknown":
-        champ_info = game_data.get_champion_info(champion)
+    if champion:
+        # Info, habilidades e winrate numa consulta só
+        bundle = game_data.get_champion_bundle(champion, lane) or {}
+        champ_info = bundle.get("info")
         if champ_info:
             roles = ", ".join(champ_info.get("roles") or [])
             lanes = ", ".join(champ_info.get("lanes") or [])
             difficulty = champ_info.get("difficulty", 0)
 
-            lines.append(f"Your champion ({champion}):")
+            w(f"Your champion ({champion}):\n")
             if roles:
-                lines.append(f"  - Roles: {roles}")
+                w(f"  - Roles: {roles}\n")
             if lanes:
-                lines.append(f"  - Best lanes: {lanes}")
+                w(f"  - Best lanes: {lanes}\n")
             if difficulty:
-                lines.append(f"  - Difficulty: {difficulty}/10")
+                w(f"  - Difficulty: {difficulty}/10\n")
 
-        abilities = game_data.get_champion_abilities(champion)
+        abilities = bundle.get("abilities")
         if abilities:
-            lines.append("  - Abilities:")
+            w("  - Abilities:\n")
             for ability in abilities[:4]:
-                name = ability.get("name") or ""
-                desc = ability.get("description") or ""
-                short = desc.replace("\n", " " ).strip()
-                if len(short) > 120:
-                    short = short[:117].rstrip() + "..."
-                if name and short:
-                    lines.append(f"    - {name}: {short}")
-                elif name:
-                    lines.append(f"    - {name}")
+                line = _render_ability(ability)
+                if line:
+                    w(line)
 
         # Winrate do campeão
-        champ_wr = game_data.get_champion_winrate(champion, lane if lane != "unknown" else None)
+        champ_wr = bundle.get("winrate")
         if champ_wr:
-            lines.append(f"  - Win rate ({champ_wr['position']}): {champ_wr['win_rate']:.1f}%")
+            w(f"  - Win rate ({champ_wr['position']}): {champ_wr['win_rate']:.1f}%\n")
             tier = champ_wr.get("tier", 5)
-            tier_name = {1: "S+", 2: "S", 3: "A", 4: "B", 5: "C"}.get(tier, "?")
-            lines.append(f"  - Tier: {tier_name}")
+            tier_name = _TIER_NAMES.get(tier, "?")
+            w(f"  - Tier: {tier_name}\n")
 
     # Se temos múltiplos inimigos, usar análise de composição
     if enemies and len(enemies) > 1:
-        lines.append("\nEnemy team composition:")
-        for enemy_data in enemies:
-            enemy_name = enemy_data.get("champion", "")
-            enemy_status = enemy_data.get("status", "even")
-            is_laner = enemy_data.get("is_laner", False)
-
-            enemy_info = game_data.get_champion_info(enemy_name)
+        w("\nEnemy team composition:\n")
+        # Campos extraídos uma vez; as infos ficam no memo do turno e são
+        # reaproveitadas pela análise de composição logo abaixo
+        names = [e.get("champion", "") for e in enemies]
+        statuses = [e.get("status", "even") for e in enemies]
+        laners = [e.get("is_laner", False) for e in enemies]
+        for enemy_name, enemy_status, is_laner in zip(names, statuses, laners):
+            enemy_info = champion_info(enemy_name)
             if enemy_info:
                 roles = ", ".join(enemy_info.get("roles") or [])
-                damage = enemy_info.get("damage", 5)
-
-                status_label = ""
-                if enemy_status == "ahead":
-                    status_label = " [FED - THREAT]"
-                elif enemy_status == "behind":
-                    status_label = " [behind]"
-
+                status_label = _ENEMY_STATUS_LABELS.get(enemy_status, "")
                 laner_label = " (your lane)" if is_laner else ""
-                lines.append(f"  - {enemy_name}{laner_label}{status_label}: {roles}")
+                w(f"  - {enemy_name}{laner_label}{status_label}: {roles}\n")
 
         # Análise de composição
-        comp_analysis = nlu.analyze_team_composition(enemies)
+        comp_analysis = nlu.analyze_team_composition(enemies, get_info=champion_info)
 
         # Resumo de dano do time
         phys = comp_analysis.get("damage_physical", 0)
         magic = comp_analysis.get("damage_magic", 0)
         if phys > magic:
-            lines.append(f"\nTeam damage: Mostly PHYSICAL ({phys} vs {magic} magic)")
+            w(f"\nTeam damage: Mostly PHYSICAL ({phys} vs {magic} magic)\n")
         elif magic > phys:
-            lines.append(f"\nTeam damage: Mostly MAGIC ({magic} vs {phys} physical)")
+            w(f"\nTeam damage: Mostly MAGIC ({magic} vs {phys} physical)\n")
         else:
-            lines.append(f"\nTeam damage: Mixed ({phys} physical, {magic} magic)")
+            w(f"\nTeam damage: Mixed ({phys} physical, {magic} magic)\n")
 
         # Características importantes
         traits = []
@@ -154,83 +320,67 @@ def _build_game_data_block(
         if comp_analysis.get("has_assassin"):
             traits.append("HAS ASSASSIN (be careful)")
         if traits:
-            lines.append(f"Team traits: {', '.join(traits)}")
+            w(f"Team traits: {', '.join(traits)}\n")
 
         # Threats (inimigos fed)
         threats = comp_analysis.get("threats", [])
         if threats:
             threat_names = [t["champion"] for t in threats]
-            lines.append(f"Main threats: {', '.join(threat_names)}")
+            w(f"Main threats: {', '.join(threat_names)}\n")
 
         # Recomendações de itens baseadas na composição
         recommended = comp_analysis.get("recommended_defenses", [])
         if recommended:
             suggested_items = []
-            if "anti_heal" in recommended:
-                anti_heal = game_data.get_counter_items(needs_anti_heal=True)
-                if anti_heal:
-                    suggested_items.append(f"Anti-heal: {anti_heal[0]['name']}")
-            if "armor_pen" in recommended:
-                armor_pen = game_data.get_counter_items(needs_armor_pen=True)
-                if armor_pen:
-                    suggested_items.append(f"Armor pen: {armor_pen[0]['name']}")
-            if "magic_resist" in recommended:
-                mr_items = game_data.get_counter_items(needs_magic_resist=True)
-                if mr_items:
-                    suggested_items.append(f"Magic resist: {mr_items[0]['name']}")
-            if "armor" in recommended:
-                armor_items = game_data.get_counter_items(needs_armor=True)
-                if armor_items:
-                    suggested_items.append(f"Armor: {armor_items[0]['name']}")
+            for defense, flag, label in _DEFENSE_COUNTERS:
+                if defense in recommended:
+                    counter_items = game_data.get_counter_items(**{flag: True})
+                    if counter_items:
+                        suggested_items.append(f"{label}: {counter_items[0]['name']}")
 
             if suggested_items:
-                lines.append("\nRecommended items for this game:")
+                w("\nRecommended items for this game:\n")
                 for item in suggested_items[:4]:
-                    lines.append(f"  - {item}")
+                    w(f"  - {item}\n")
 
     # Fallback: inimigo único (laning phase)
-    elif enemy and enemy != "unknown":
-        enemy_info = game_data.get_champion_info(enemy)
+    elif enemy:
+        enemy_bundle = game_data.get_champion_bundle(enemy, lane) or {}
+        enemy_info = enemy_bundle.get("info")
         if enemy_info:
             roles = ", ".join(enemy_info.get("roles") or [])
             damage = enemy_info.get("damage", 0)
 
-            lines.append(f"\nLane opponent ({enemy}):")
+            w(f"\nLane opponent ({enemy}):\n")
             if roles:
-                lines.append(f"  - Roles: {roles}")
+                w(f"  - Roles: {roles}\n")
             if damage:
                 damage_type = "high damage" if damage >= 7 else "moderate damage" if damage >= 4 else "low damage"
-                lines.append(f"  - Threat: {damage_type}")
+                w(f"  - Threat: {damage_type}\n")
 
-        enemy_abilities = game_data.get_champion_abilities(enemy)
+        enemy_abilities = enemy_bundle.get("abilities")
         if enemy_abilities:
-            lines.append("  - Enemy abilities:")
+            w("  - Enemy abilities:\n")
             for ability in enemy_abilities[:4]:
-                name = ability.get("name") or ""
-                desc = ability.get("description") or ""
-                short = desc.replace("\n", " " ).strip()
-                if len(short) > 120:
-                    short = short[:117].rstrip() + "..."
-                if name and short:
-                    lines.append(f"    - {name}: {short}")
-                elif name:
-                    lines.append(f"    - {name}")
+                line = _render_ability(ability)
+                if line:
+                    w(line)
 
         # Winrate do inimigo
-        enemy_wr = game_data.get_champion_winrate(enemy, lane if lane != "unknown" else None)
+        enemy_wr = enemy_bundle.get("winrate")
         if enemy_wr:
-            lines.append(f"  - Win rate: {enemy_wr['win_rate']:.1f}%")
+            w(f"  - Win rate: {enemy_wr['win_rate']:.1f}%\n")
 
         # Dicas de matchup
-        if champion and champion != "unknown":
-            tips = game_data.get_matchup_tips(champion, enemy, lane if lane != "unknown" else None)
+        if champion:
+            tips = game_data.get_matchup_tips(champion, enemy, lane)
             if tips:
-                lines.append("Matchup tips:")
+                w("Matchup tips:\n")
                 for tip in (tips.get("tips") or [])[:2]:
-                    lines.append(f"  - {tip}")
+                    w(f"  - {tip}\n")
                 if tips.get("counter_items"):
                     items = ", ".join(tips["counter_items"][:3])
-                    lines.append(f"  - Counter items: {items}")
+                    w(f"  - Counter items: {items}\n")
 
         # Sugestões de itens baseadas no inimigo único
         if enemy_info:
@@ -252,11 +402,17 @@ def _build_game_data_block(
                     suggested_items.append(f"Magic resist: {mr_items[0]['name']}")
 
             if suggested_items:
-                lines.append("Suggested counter items:")
+                w("Suggested counter items:\n")
                 for item in suggested_items[:3]:
-                    lines.append(f"  - {item}")
+                    w(f"  - {item}\n")
 
-    return "\n".join(lines) if lines else "No game data available"
+    text = buf.getvalue()
+    # Sem o "\n" final, como no join por linhas
+    return text[:-1] if text else "No game data available"
+
+
+def _known(value: Any) -> Any:
+    return None if not value or value == "unknown" else value
 
 
 def _build_prompt(
@@ -264,64 +420,47 @@ def _build_prompt(
     state: dict[str, Any],
     intent: str,
     history: list[dict[str, Any]],
-    advice: list[str],
+    advice: list[dict[str, Any]],
     locale: str | None,
     user_text: str,
+    corrections: list[dict[str, Any]] | None = None,
 ) -> str:
-    locale = locale or "pt-BR"
-    is_en = locale.lower().startswith("en")
-    language_line = (
-        "Reply in English (en-US)."
-        if is_en
-        else "Responda em português (pt-BR)."
-    )
+    template = _PROMPT_TEMPLATES["en" if locale and locale[:2].lower() == "en" else "pt"]
 
-    champion = state.get("champion") or "unknown"
-    lane = state.get("lane") or "unknown"
-    enemy = state.get("enemy") or "unknown"
+    # None quando ausente; "unknown" só aparece no texto do prompt
+    champion = _known(state.get("champion"))
+    lane = _known(state.get("lane"))
+    enemy = _known(state.get("enemy"))
     enemies = state.get("enemies") or []  # Lista de múltiplos inimigos
     phase = state.get("game_phase") or "unknown"
     status = state.get("status") or "unknown"
     gold = state.get("gold")
     last_reply = state.get("last_reply") or ""
 
-    # Busca correções aprendidas do banco
-    relevant_champions = []
-    if champion and champion != "unknown":
-        relevant_champions.append(champion)
-    if enemy and enemy != "unknown":
-        relevant_champions.append(enemy)
-    for e in enemies:
-        if e.get("champion"):
-            relevant_champions.append(e["champion"])
-
-    corrections = db.retrieve_corrections(
-        champions=relevant_champions if relevant_champions else None,
-        limit=5,
-    )
+    if corrections is None:
+        corrections = _fetch_corrections(state)
 
     self_items = ", ".join(state.get("self_items", [])) or "none"
     enemy_items_map = state.get("enemy_items", {}) or {}
-    enemy_items = (
-        "; ".join(
-            f"{champ}: {', '.join(items)}"
-            for champ, items in enemy_items_map.items()
-            if items
-        )
-        or "none"
-    )
-
-    history_lines = []
+    enemy_parts: list[str] = []
+    for champ, items in enemy_items_map.items():
+        if items:
+            enemy_parts += (champ, ": ", ", ".join(items), "; ")
+    # Sem o último "; "
+    enemy_items = "".join(enemy_parts[:-1]) or "none"
+
+    history_lines: list[str] = []
+    history_append = history_lines.append
     for item in history[-4:]:
         text = item.get("text")
         reply = item.get("reply")
         if text:
-            history_lines.append(f"User: {text}")
+            history_append(f"User: {text}")
         if reply:
-            history_lines.append(f"Coach: {reply}")
+            history_append(f"Coach: {reply}")
     history_block = "\n".join(history_lines) or "none"
 
-    advice_block = "\n".join(f"- {item}" for item in advice[:3]) or "none"
+    advice_block = "\n".join([f"- {item['reply_text']}" for item in advice[:3]]) or "none"
 
     # Monta bloco de correções aprendidas
     corrections_lines = []
@@ -352,47 +491,24 @@ def _build_prompt(
             for e in enemies
         )
     else:
-        enemies_str = enemy
-
-    return (
-        "You are NexusCoach, an in-game Wild Rift MOBILE voice coach. "
-        "Be short, tactical, friendly and PRACTICAL. "
-        "Use the game data below to give accurate advice. "
-        "Consider the FULL enemy team composition when giving item/strategy advice. "
-        "\n"
-        "IMPORTANT RULES:\n"
-        "- This is MOBILE Wild Rift, NOT PC League of Legends.\n"
-        "- If ability data is available in Game Data, it is the source of truth.\n"
-        "- If ability data is missing, do NOT invent ability mechanics.\n"
-        "- NEVER use keyboard keys like Q, W, E, R to refer to abilities.\n"
-        "- Instead, describe abilities by their VISUAL EFFECT or NAME.\n"
-        "  Examples: 'his shadow clone', 'the spinning slash', 'the hook', 'her charm', 'the dash'.\n"
-        "- When giving tips, explain HOW to do it, not just WHAT to do.\n"
-        "  Bad: 'Bait his combo then punish'\n"
-        "  Good: 'Stay behind minions - when he throws his shadow at you, sidestep and attack while it recharges'\n"
-        "- Be specific about timing, positioning, or visual cues when possible.\n"
-        "- If context is missing, ask one short question.\n"
-        "- Keep answers under 3 sentences.\n"
-        f"{language_line}\n\n"
-        "Context:\n"
-        f"- Champion: {champion}\n"
-        f"- Lane: {lane}\n"
-        f"- Enemies: {enemies_str}\n"
-        f"- Phase: {phase}\n"
-        f"- Status: {status}\n"
-        f"- Gold: {gold if gold is not None else 'unknown'}\n"
-        f"- Your items: {self_items}\n"
-        f"- Enemy items: {enemy_items}\n"
-        f"- Intent hint: {intent}\n"
-        f"- Last coach tip: {last_reply or 'none'}\n\n"
-        "Game Data (from Wild Rift stats):\n"
-        f"{game_data_block}\n\n"
-        "Useful tips from memory:\n"
-        f"{advice_block}\n\n"
-        "LEARNED CORRECTIONS (from user feedback - ALWAYS respect these):\n"
-        f"{corrections_block}\n\n"
-        "Recent conversation:\n"
-        f"{history_block}\n\n"
-        "User message:\n"
-        f"{user_text}\n"
+        enemies_str = enemy or "unknown"
+
+    return template.format_map(
+        {
+            "champion": champion or "unknown",
+            "lane": lane or "unknown",
+            "enemies": enemies_str,
+            "phase": phase,
+            "status": status,
+            "gold": gold if gold is not None else "unknown",
+            "self_items": self_items,
+            "enemy_items": enemy_items,
+            "intent": intent,
+            "last_reply": last_reply or "none",
+            "game_data": game_data_block,
+            "advice": advice_block,
+            "corrections": corrections_block,
+            "history": history_block,
+            "user_text": user_text,
+        }
     )
@@ -1,20 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from decimal import Decimal
 from typing import Any
 from uuid import uuid4
 
+import orjson
 from fastapi import FastAPI, File, Form, Request, UploadFile
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from app import db, game_data, nlu, strategy, store, stt
+from app import db, game_data, llm, migrations, nlu, strategy, store, stt
 from app.errors import AppError
 from app.i18n import msg
 from app.models import (
-    EnvelopeError,
     EnvelopeOk,
-    ErrorPayload,
     SessionEndRequest,
     SessionStartRequest,
     TurnRequest,
@@ -23,37 +26,73 @@ from app.models import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("nexuscoach")
 
-app = FastAPI(title="NexusCoach API", version="0.1.0")
+
+def _orjson_default(value: Any) -> Any:
+    # Colunas NUMERIC do Postgres chegam como Decimal
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse serializada com orjson em vez do json da stdlib."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Schema criado uma vez aqui, fora do caminho das requisições
+    try:
+        migrations.run_migrations()
+    except Exception:
+        logger.exception("postgres_migrations_failed")
+    yield
+    # Garante que fins de sessão enfileirados sejam gravados antes de sair
+    db.flush_pending_writes()
+    db.close_pool()
+
+
+app = FastAPI(
+    title="NexusCoach API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    logger.info(f"→ {request.method} {request.url.path}")
+    method = request.method
+    path = request.url.path
+    logger.info("→ %s %s", method, path)
     try:
         response = await call_next(request)
-        logger.info(f"← {request.method} {request.url.path} [{response.status_code}]")
+        logger.info("← %s %s [%d]", method, path, response.status_code)
         return response
     except Exception as e:
-        logger.exception(f"✗ {request.method} {request.url.path} error: {e}")
+        logger.exception("✗ %s %s error: %s", method, path, e)
         raise
 session_store = store.get_store()
 
 
 def envelope_ok(data: dict[str, Any]) -> JSONResponse:
-    payload = EnvelopeOk(data=data)
-    return JSONResponse(status_code=200, content=payload.model_dump())
+    # Mesmo formato de EnvelopeOk, sem validar/copiar o payload via pydantic
+    return ORJSONResponse(status_code=200, content={"ok": True, "data": data})
 
 
 def envelope_error(code: str, user_message: str, status_code: int) -> JSONResponse:
-    correlation_id = str(uuid4())
-    payload = EnvelopeError(
-        error=ErrorPayload(
-            code=code,
-            user_message=user_message,
-            correlation_id=correlation_id,
-        )
-    )
-    return JSONResponse(status_code=status_code, content=payload.model_dump())
+    # Mesmo formato de EnvelopeError, montado direto
+    payload = {
+        "ok": False,
+        "error": {
+            "code": code,
+            "user_message": user_message,
+            "correlation_id": uuid4().hex,
+        },
+    }
+    return ORJSONResponse(status_code=status_code, content=payload)
 
 
 @app.exception_handler(AppError)
@@ -68,7 +107,7 @@ async def unhandled_error_handler(_: Request, exc: Exception) -> JSONResponse:
     return envelope_error("INTERNAL_ERROR", msg(None, "internal_error"), 500)
 
 
-@app.post("/session/start")
+@app.post("/session/start", response_model=EnvelopeOk)
 async def session_start(request: SessionStartRequest) -> JSONResponse:
     session = session_store.create_session(
         initial_state=request.initial_context.model_dump(),
@@ -77,9 +116,9 @@ async def session_start(request: SessionStartRequest) -> JSONResponse:
     return envelope_ok({"session_id": session.session_id, "state": session.state})
 
 
-@app.post("/turn")
+@app.post("/turn", response_model=EnvelopeOk)
 async def turn(request: TurnRequest) -> JSONResponse:
-    session = session_store.get_session(request.session_id)
+    session = await run_in_threadpool(session_store.get_session, request.session_id)
     if session is None:
         raise AppError(
             code="SESSION_NOT_FOUND",
@@ -87,7 +126,7 @@ async def turn(request: TurnRequest) -> JSONResponse:
             status_code=404,
         )
 
-    response = _process_turn(
+    response = await _process_turn(
         session=session,
         text=request.text,
         timestamp=request.timestamp,
@@ -96,55 +135,60 @@ async def turn(request: TurnRequest) -> JSONResponse:
     return envelope_ok(response)
 
 
-@app.post("/turn/audio")
+@app.post("/turn/audio", response_model=EnvelopeOk)
 async def turn_audio(
     session_id: str = Form(...),
     audio: UploadFile = File(...),
     locale: str | None = Form(None),
 ) -> JSONResponse:
-    session = session_store.get_session(session_id)
+    session = await run_in_threadpool(session_store.get_session, session_id)
     if session is None:
         raise AppError(
             code="SESSION_NOT_FOUND",
             user_message=msg(None, "session_not_found"),
             status_code=404,
         )
-    audio_bytes = await audio.read()
-    if not audio_bytes:
+    if _upload_is_empty(audio):
         raise AppError(
             code="STT_UNCLEAR",
             user_message=msg(locale or session.locale, "stt_unclear"),
             status_code=400,
         )
-    text = stt.transcribe_audio(audio_bytes, locale or session.locale)
-    response = _process_turn(session=session, text=text, timestamp=None, client_state_hint=None)
+    # O STT lê do arquivo temporário do upload; o áudio não é copiado para memória
+    text = await run_in_threadpool(stt.transcribe_audio, audio.file, locale or session.locale)
+    response = await _process_turn(session=session, text=text, timestamp=None, client_state_hint=None)
     return envelope_ok(response)
 
 
-@app.post("/session/end")
+def _upload_is_empty(audio: UploadFile) -> bool:
+    if audio.size is not None:
+        return audio.size == 0
+    empty = not audio.file.read(1)
+    audio.file.seek(0)
+    return empty
+
+
+@app.post("/session/end", response_model=EnvelopeOk)
 async def session_end(request: SessionEndRequest) -> JSONResponse:
     feedback = request.feedback.model_dump() if request.feedback else None
-    session = session_store.end_session(request.session_id)
+    session = await run_in_threadpool(session_store.end_session, request.session_id)
     if session is None:
         raise AppError(
             code="SESSION_NOT_FOUND",
             user_message=msg(None, "session_already_ended"),
             status_code=404,
         )
+    # Só enfileira: o worker do db grava em lote, fora da resposta
     db.persist_session_end(session, feedback)
     return envelope_ok({"ok": True})
 
 
-def _process_turn(
+async def _process_turn(
     session: store.Session,
     text: str,
     timestamp: datetime | None,
     client_state_hint: dict[str, Any] | None,
 ) -> dict[str, Any]:
-    updates: dict[str, Any] = {}
-    if client_state_hint:
-        updates.update(client_state_hint)
-
     text_clean = text.strip()
     if not text_clean:
         raise AppError(
@@ -153,59 +197,53 @@ def _process_turn(
             status_code=400,
         )
 
-    updates.update(nlu.extract_state_hints(text_clean))
-    item_hints = nlu.extract_item_hints(text_clean)
-    if item_hints:
-        updates.update(_merge_item_hints(session.state, item_hints))
-    updates["last_user_text"] = text_clean
+    # NLU é CPU puro: roda numa thread para não travar o event loop
+    updates, intent = await run_in_threadpool(
+        _analyze_text, session.state, text_clean, client_state_hint
+    )
     updates["timestamp"] = (timestamp or datetime.now(tz=timezone.utc)).isoformat()
 
-    # Não permite troca de campeãok, maso/rota depois do contexto inicial.
-    if session.state.get("champion"):
-        updates.pop("champion", None)
-    if session.state.get("lane"):
-        updates.pop("lane", None)
+    # Estado do turno montado localmente; a sessão é gravada uma vez só, no fim
+    state = {**session.state, **updates}
 
-    updated_session = session_store.update_session(session.session_id, updates)
-    if updated_session is None:
-        raise AppError(
-            code="SESSION_NOT_FOUND",
-            user_message=msg(session.locale, "session_not_found"),
-            status_code=404,
-        )
-
-    intent = nlu.infer_intent(text_clean)
-    advice = db.retrieve_advice(updated_session.state, intent)
-    reply = strategy.generate_reply(
-        updated_session.state,
+    # Consultas independentes: rodam em paralelo em vez de somar as latências
+    advice, corrections = await asyncio.gather(
+        run_in_threadpool(db.retrieve_advice, state, intent),
+        run_in_threadpool(llm.retrieve_prompt_corrections, state),
+    )
+    reply = await strategy.generate_reply(
+        state,
         intent,
-        updated_session.history,
+        session.history,
         advice,
-        updated_session.locale,
+        session.locale,
         text_clean,
+        corrections=corrections,
     )
-    session_store.update_session(
-        session.session_id,
-        {"last_intent": intent, "last_reply": reply},
-    )
+    updates["last_intent"] = intent
+    updates["last_reply"] = reply
     turn_entry = {
         "text": text_clean,
         "reply": reply,
         "intent": intent,
         "context": {
-            "champion": updated_session.state.get("champion"),
-            "lane": updated_session.state.get("lane"),
-            "enemy": updated_session.state.get("enemy"),
-            "game_phase": updated_session.state.get("game_phase"),
-            "status": updated_session.state.get("status"),
-            "gold": updated_session.state.get("gold"),
+            "champion": state.get("champion"),
+            "lane": state.get("lane"),
+            "enemy": state.get("enemy"),
+            "game_phase": state.get("game_phase"),
+            "status": state.get("status"),
+            "gold": state.get("gold"),
         },
         "timestamp": updates["timestamp"],
     }
-    session_store.append_history(session.session_id, turn_entry)
 
-    refreshed = session_store.get_session(session.session_id) or updated_session
-    db.persist_turn(refreshed, turn_entry)
+    refreshed = await run_in_threadpool(_save_turn, session.session_id, updates, turn_entry)
+    if refreshed is None:
+        raise AppError(
+            code="SESSION_NOT_FOUND",
+            user_message=msg(session.locale, "session_not_found"),
+            status_code=404,
+        )
     return {
         "reply_text": reply,
         "updated_state": refreshed.state,
@@ -213,39 +251,81 @@ def _process_turn(
     }
 
 
+def _analyze_text(
+    state: dict[str, Any],
+    text_clean: str,
+    client_state_hint: dict[str, Any] | None,
+) -> tuple[dict[str, Any], str]:
+    """Extrai do texto as atualizações de estado e a intenção do turno."""
+    updates: dict[str, Any] = {}
+    if client_state_hint:
+        updates.update(client_state_hint)
+
+    # Normaliza uma vez só; todos os extratores trabalham sobre a mesma forma
+    text_norm = nlu.normalize(text_clean)
+    updates.update(nlu.extract_state_hints_normalized(text_norm))
+    item_hints = nlu.extract_item_hints_normalized(text_norm)
+    if item_hints:
+        # Mesma chave dos sujeitos nomeados: "Zed" do cliente e "zed" do texto
+        # não podem virar duas entradas em enemy_items
+        enemy = updates.get("enemy") or state.get("enemy")
+        if enemy:
+            enemy = nlu.canonical_champion(enemy)
+        updates.update(_merge_item_hints(state, item_hints, enemy))
+    updates["last_user_text"] = text_clean
+
+    # Não permite troca de campeãok, maso/rota depois do contexto inicial.
+    if state.get("champion"):
+        updates.pop("champion", None)
+    if state.get("lane"):
+        updates.pop("lane", None)
+
+    return updates, nlu.infer_intent(text_norm)
+
+
+def _save_turn(
+    session_id: str, updates: dict[str, Any], turn_entry: dict[str, Any]
+) -> store.Session | None:
+    refreshed = session_store.apply_turn(session_id, updates, turn_entry)
+    if refreshed is not None:
+        db.persist_turn(refreshed, turn_entry)
+    return refreshed
+
+
 def _merge_item_hints(
-    state: dict[str, Any], item_hints: dict[str, Any]
+    state: dict[str, Any], item_hints: dict[str, Any], enemy: str | None = None
 ) -> dict[str, Any]:
     updates: dict[str, Any] = {}
 
+    # Listas/dicts do estado só são copiados quando vão de fato mudar
     if "self_item" in item_hints:
         entry = item_hints["self_item"]
         item = entry.get("item")
         if item:
-            self_items = list(state.get("self_items", []))
-            if entry.get("status") == "has" and item not in self_items:
-                self_items.append(item)
-            updates["self_items"] = self_items
-            if entry.get("status") == "building":
+            status = entry.get("status")
+            if status == "has":
+                self_items = state.get("self_items", [])
+                if item not in self_items:
+                    updates["self_items"] = [*self_items, item]
+            elif status == "building":
                 updates["self_building"] = item
             updates["last_self_item"] = item
 
     if "enemy_item" in item_hints:
         entry = item_hints["enemy_item"]
-        champion = entry.get("champion")
+        # Sem nome ("o inimigo comprou ..."): atribui ao inimigo atual da sessão
+        champion = entry.get("champion") or enemy
         item = entry.get("item")
         if champion and item:
-            enemy_items = dict(state.get("enemy_items", {}))
-            current = list(enemy_items.get(champion, []))
-            if entry.get("status") == "has" and item not in current:
-                current.append(item)
-            enemy_items[champion] = current
-            updates["enemy_items"] = enemy_items
-
-            if entry.get("status") == "building":
-                enemy_building = dict(state.get("enemy_building", {}))
-                enemy_building[champion] = item
-                updates["enemy_building"] = enemy_building
+            status = entry.get("status")
+            if status == "has":
+                enemy_items = state.get("enemy_items", {})
+                current = enemy_items.get(champion, [])
+                if item not in current:
+                    updates["enemy_items"] = {**enemy_items, champion: [*current, item]}
+            elif status == "building":
+                enemy_building = state.get("enemy_building", {})
+                updates["enemy_building"] = {**enemy_building, champion: item}
 
             updates["last_enemy_item"] = {"champion": champion, "item": item}
 
@@ -257,11 +337,11 @@ def _merge_item_hints(
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-@app.post("/admin/sync-game-data")
+@app.post("/admin/sync-game-data", response_model=EnvelopeOk)
 async def sync_game_data() -> JSONResponse:
     """Sincroniza dados do jogo (campeões, stats, winrates) das APIs externas."""
     logger.info("Starting game data sync...")
-    results = game_data.sync_all()
+    results = await run_in_threadpool(game_data.sync_all)
     logger.info("Game data sync completed: %s", results)
     return envelope_ok({
         "synced": results,
@@ -269,10 +349,10 @@ async def sync_game_data() -> JSONResponse:
     })
 
 
-@app.get("/admin/champion/{champion_name}")
+@app.get("/admin/champion/{champion_name}", response_model=EnvelopeOk)
 async def get_champion(champion_name: str) -> JSONResponse:
     """Busca informações de um campeão pelo nome."""
-    info = game_data.get_champion_info(champion_name)
+    info = await run_in_threadpool(game_data.get_champion_info, champion_name)
     if info is None:
         raise AppError(
             code="CHAMPION_NOT_FOUND",
@@ -280,17 +360,18 @@ async def get_champion(champion_name: str) -> JSONResponse:
             status_code=404,
         )
 
-    winrate = game_data.get_champion_winrate(champion_name)
+    winrate = await run_in_threadpool(game_data.get_champion_winrate, champion_name)
     if winrate:
-        info["winrate"] = winrate
+        # info vem do cache de game_data; não mutar
+        info = {**info, "winrate": winrate}
 
     return envelope_ok(info)
 
 
-@app.get("/admin/item/{item_name}")
+@app.get("/admin/item/{item_name}", response_model=EnvelopeOk)
 async def get_item(item_name: str) -> JSONResponse:
     """Busca informações de um item pelo nome."""
-    info = game_data.get_item_info(item_name)
+    info = await run_in_threadpool(game_data.get_item_info, item_name)
     if info is None:
         raise AppError(
             code="ITEM_NOT_FOUND",
@@ -300,26 +381,30 @@ async def get_item(item_name: str) -> JSONResponse:
     return envelope_ok(info)
 
 
-@app.get("/admin/items")
+@app.get("/admin/items", response_model=EnvelopeOk)
 async def list_items(category: str | None = None) -> JSONResponse:
     """Lista itens, opcionalmente filtrados por categoria."""
-    if category:
-        items = game_data.get_items_by_category(category, limit=50)
-    else:
-        # Lista todos os itens de todas as categorias
-        items = []
-        for cat in ["physical", "magic", "defense", "boots", "support"]:
-            items.extend(game_data.get_items_by_category(cat, limit=20))
+    items = await run_in_threadpool(_list_items, category)
     return envelope_ok({"items": items, "count": len(items)})
 
 
-@app.get("/admin/session/{session_id}/turns")
+def _list_items(category: str | None) -> list[dict[str, Any]]:
+    if category:
+        return game_data.get_items_by_category(category, limit=50)
+    # Lista todos os itens de todas as categorias
+    items: list[dict[str, Any]] = []
+    for cat in ["physical", "magic", "defense", "boots", "support"]:
+        items.extend(game_data.get_items_by_category(cat, limit=20))
+    return items
+
+
+@app.get("/admin/session/{session_id}/turns", response_model=EnvelopeOk)
 async def get_session_turns(session_id: str, limit: int = 50) -> JSONResponse:
-    turns = db.fetch_session_turns(session_id, limit=limit)
+    turns = await run_in_threadpool(db.fetch_session_turns, session_id, limit)
     return envelope_ok({"session_id": session_id, "turns": turns})
 
 
-@app.get("/admin/turns")
+@app.get("/admin/turns", response_model=EnvelopeOk)
 async def get_recent_turns(limit: int = 50) -> JSONResponse:
-    turns = db.fetch_recent_turns(limit=limit)
+    turns = await run_in_threadpool(db.fetch_recent_turns, limit)
     return envelope_ok({"turns": turns})
@@ -0,0 +1,311 @@
+"""Migrações idempotentes do schema, executadas uma vez na inicialização."""
+
+from __future__ import annotations
+
+import logging
+
+import psycopg
+
+from app.config import POSTGRES_DSN
+
+logger = logging.getLogger("nexuscoach")
+
+
+def run_migrations(conn: psycopg.Connection | None = None) -> bool:
+    """Cria tabelas e índices que ainda não existem; seguro para rodar várias vezes."""
+    if conn is not None:
+        _apply(conn)
+        conn.commit()
+        return True
+    if not POSTGRES_DSN:
+        return False
+    from app.db import get_pool
+
+    with get_pool().connection() as local_conn:
+        _apply(local_conn)
+        local_conn.commit()
+    return True
+
+
+def _apply(conn: psycopg.Connection) -> None:
+    # UNLOGGED: sem WAL nas gravações de fim de sessão (só analytics). Em crash do
+    # Postgres a tabela é truncada; session_turns continua logada.
+    conn.execute(
+        """
+        create unlogged table if not exists session_logs (
+            session_id text primary key,
+            locale text,
+            state jsonb,
+            history jsonb,
+            feedback jsonb,
+            ended_at timestamptz default now()
+        )
+        """
+    )
+    # Bancos criados antes continuam com a tabela logada: converte uma vez só
+    # (o ALTER reescreve a tabela e pega lock exclusivo, então só quando precisa)
+    logged = conn.execute(
+        "select relpersistence = 'p' from pg_class where oid = 'session_logs'::regclass"
+    ).fetchone()
+    if logged and logged[0]:
+        conn.execute("alter table session_logs set unlogged")
+    conn.execute(
+        """
+        create table if not exists session_turns (
+            id bigserial primary key,
+            session_id text not null,
+            locale text,
+            state jsonb,
+            turn jsonb,
+            created_at timestamptz default now()
+        )
+        """
+    )
+    conn.execute(
+        """
+        create index if not exists session_turns_session_idx
+        on session_turns (session_id)
+        """
+    )
+    conn.execute(
+        """
+        create table if not exists advice_bank (
+            id bigserial primary key,
+            champion text,
+            lane text,
+            enemy text,
+            intent text,
+            game_phase text,
+            status text,
+            reply_text text not null,
+            positive_count int default 0,
+            negative_count int default 0,
+            score int default 0,
+            last_seen timestamptz default now()
+        )
+        """
+    )
+    conn.execute(
+        """
+        create unique index if not exists advice_unique
+        on advice_bank (champion, lane, enemy, intent, game_phase, status, reply_text)
+        """
+    )
+    conn.execute(
+        """
+        create index if not exists advice_rank_idx
+        on advice_bank (score desc, last_seen desc)
+        include (reply_text, champion, lane, enemy, intent, game_phase, status)
+        """
+    )
+    # Tabela de correções aprendidas do feedback
+    conn.execute(
+        """
+        create table if not exists corrections (
+            id bigserial primary key,
+            champion text,
+            ability text,
+            topic text,
+            wrong_info text not null,
+            correct_info text not null,
+            source_session text,
+            confidence int default 1,
+            created_at timestamptz default now()
+        )
+        """
+    )
+    conn.execute(
+        """
+        create index if not exists corrections_champion_idx on corrections (lower(champion))
+        """
+    )
+    conn.execute(
+        """
+        create index if not exists corrections_topic_idx on corrections (lower(topic))
+        """
+    )
+    _dedupe_corrections(conn)
+    conn.execute(
+        """
+        create unique index if not exists corrections_dedup
+        on corrections (
+            lower(coalesce(champion, '')),
+            lower(coalesce(ability, '')),
+            lower(coalesce(topic, '')),
+            lower(correct_info)
+        )
+        """
+    )
+    _apply_game_tables(conn)
+
+
+def _dedupe_corrections(conn: psycopg.Connection) -> None:
+    """Funde correções duplicadas (soma confidence, fica o menor id) antes do índice único."""
+    # Bancos antigos podem ter duplicatas da época do select-then-write; sem isso o
+    # create unique index falha e derruba o resto da migração
+    exists = conn.execute("select to_regclass('corrections_dedup') is not null").fetchone()
+    if exists and exists[0]:
+        return
+    conn.execute(
+        """
+        with grouped as (
+            select
+                id,
+                min(id) over w as keep_id,
+                count(*) over w as copies,
+                sum(coalesce(confidence, 1)) over w as total
+            from corrections
+            window w as (
+                partition by
+                    lower(coalesce(champion, '')),
+                    lower(coalesce(ability, '')),
+                    lower(coalesce(topic, '')),
+                    lower(correct_info)
+            )
+        ),
+        merged as (
+            update corrections c
+            set confidence = g.total
+            from grouped g
+            where c.id = g.id and g.id = g.keep_id and g.copies > 1
+        )
+        delete from corrections c
+        using grouped g
+        where c.id = g.id and g.id <> g.keep_id
+        """
+    )
+
+
+def _apply_game_tables(conn: psycopg.Connection) -> None:
+    """Tabelas de dados do jogo (campeões, stats, winrates, itens...)."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS champions (
+            hero_id TEXT PRIMARY KEY,
+            name_cn TEXT,
+            name_en TEXT,
+            title TEXT,
+            alias TEXT,
+            roles TEXT[],
+            lanes TEXT[],
+            difficulty INT,
+            damage INT,
+            survivability INT,
+            utility INT,
+            icon_url TEXT,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS champion_stats (
+            hero_id TEXT PRIMARY KEY REFERENCES champions(hero_id),
+            health_base NUMERIC,
+            health_scale NUMERIC,
+            mana_base NUMERIC,
+            mana_scale NUMERIC,
+            armor_base NUMERIC,
+            armor_scale NUMERIC,
+            magic_resist_base NUMERIC,
+            magic_resist_scale NUMERIC,
+            attack_base NUMERIC,
+            attack_scale NUMERIC,
+            attack_speed_base NUMERIC,
+            attack_speed_scale NUMERIC,
+            move_speed INT,
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS champion_abilities (
+            id BIGSERIAL PRIMARY KEY,
+            hero_id TEXT REFERENCES champions(hero_id),
+            champion_name TEXT,
+            ability_key TEXT,
+            ability_name TEXT,
+            description TEXT,
+            updated_at TIMESTAMPTZ DEFAULT NOW(),
+            UNIQUE(hero_id, ability_key)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS champion_winrates (
+            id BIGSERIAL PRIMARY KEY,
+            hero_id TEXT REFERENCES champions(hero_id),
+            position TEXT,
+            win_rate NUMERIC,
+            pick_rate NUMERIC,
+            ban_rate NUMERIC,
+            strength_tier INT,
+            stat_date DATE,
+            updated_at TIMESTAMPTZ DEFAULT NOW(),
+            UNIQUE(hero_id, position, stat_date)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS matchup_tips (
+            id BIGSERIAL PRIMARY KEY,
+            champion TEXT NOT NULL,
+            enemy TEXT NOT NULL,
+            lane TEXT,
+            difficulty INT,
+            tips TEXT[],
+            counter_items TEXT[],
+            power_spikes TEXT[],
+            positive_count INT DEFAULT 0,
+            negative_count INT DEFAULT 0,
+            score INT DEFAULT 0,
+            updated_at TIMESTAMPTZ DEFAULT NOW(),
+            UNIQUE(champion, enemy, lane)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS items (
+            item_id SERIAL PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            name_normalized TEXT,
+            category TEXT,
+            gold_cost INT,
+            stats JSONB,
+            passive_name TEXT,
+            passive_desc TEXT,
+            tags TEXT[],
+            updated_at TIMESTAMPTZ DEFAULT NOW()
+        )
+        """
+    )
+    # Buscas por nome usam LOWER(...); sem índice de expressão viram seq scan
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS champions_name_en_lower ON champions (LOWER(name_en))
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS champions_alias_lower ON champions (LOWER(alias))
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS champions_name_cn_lower ON champions (LOWER(name_cn))
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS items_name_lower ON items (LOWER(name))
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS items_name_normalized ON items (name_normalized)
+        """
+    )
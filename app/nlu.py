@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import re
 import unicodedata
+from collections.abc import Callable, Iterable
+from functools import lru_cache
 from typing import Any
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
 
 INTENTS = {
     "build": ["item", "build", "proximo", "prox", "comprar", "next", "buy"],
@@ -15,8 +21,9 @@ INTENTS = {
     "matchup": ["contra", "versus", "vs", "matchup", "enfrentando", "against"],
 }
 
-# Lista de campeões conhecidos do Wild Rift (nomes em inglês, minúsculos)
-KNOWN_CHAMPIONS = {
+# Lista de campeões conhecidos do Wild Rift (nomes em inglês, minúsculos);
+# cada nome aparece uma vez, na primeira categoria em que se encaixa
+KNOWN_CHAMPIONS: frozenset[str] = frozenset({
     # Fighters
     "darius", "garen", "fiora", "camille", "jax", "irelia", "riven", "renekton",
     "sett", "wukong", "xin zhao", "jarvan", "lee sin", "vi", "olaf", "tryndamere",
@@ -30,7 +37,7 @@ KNOWN_CHAMPIONS = {
     "zed", "talon", "akali", "katarina", "fizz", "ekko", "diana", "kassadin",
     "khazix", "rengar", "evelynn", "pyke", "qiyana", "leblanc", "ahri",
     # Mages
-    "lux", "ahri", "orianna", "syndra", "veigar", "brand", "zyra", "annie",
+    "lux", "orianna", "syndra", "veigar", "brand", "zyra", "annie",
     "malzahar", "viktor", "xerath", "ziggs", "velkoz", "twisted fate", "ryze",
     "cassiopeia", "aurelion sol", "seraphine", "karma", "morgana", "lulu",
     "nami", "soraka", "sona", "janna", "yuumi", "vex", "zoe", "neeko", "hwei",
@@ -38,11 +45,13 @@ KNOWN_CHAMPIONS = {
     "jinx", "caitlyn", "vayne", "kaisa", "ezreal", "lucian", "draven", "ashe",
     "miss fortune", "tristana", "twitch", "jhin", "xayah", "varus", "corki",
     "kogmaw", "sivir", "kalista", "samira", "aphelios", "zeri", "nilah", "smolder",
-    # Supports
-    "thresh", "lulu", "nami", "soraka", "sona", "janna", "yuumi", "braum",
-    "leona", "nautilus", "alistar", "blitzcrank", "rakan", "pyke", "senna",
-    "seraphine", "karma", "morgana", "zyra", "brand", "lux", "xerath",
-}
+    # Supports (os demais já estão listados como tanks/mages)
+    "rakan", "senna",
+})
+
+# Ordem fixa para resolver prefixos ("o" -> sempre o mesmo campeão); o set
+# dependia da ordem de hash de cada processo
+_CHAMPIONS_BY_LEN: tuple[str, ...] = tuple(sorted(KNOWN_CHAMPIONS, key=lambda n: (-len(n), n)))
 
 # Variações de nomes (aliases)
 CHAMPION_ALIASES = {
@@ -63,39 +72,223 @@ CHAMPION_ALIASES = {
 }
 
 
-def infer_intent(text: str) -> str:
-    text_lower = text.lower()
-    for intent, keywords in INTENTS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                return intent
-    return "general"
+# Padrões compilados uma vez no import (antes eram montados a cada turno)
+_PLAYER_PATTERNS = tuple(
+    re.compile(p)
+    for p in (
+        r"(?:estou|to|sou|jogo|jogando|vou)\s+(?:de|com)\s+(\w+)",
+        r"(?:meu|minha)\s+(\w+)",
+        r"(\w+)\s+(?:aqui|main|otp)",
+        r"(?:i am|i'm|im|playing)\s+(\w+)",
+    )
+)
 
+# Padrões para identificar inimigos e seus status
+_ENEMY_PATTERNS = tuple(
+    (re.compile(p), status)
+    for p, status in (
+        # "contra um jax no top"
+        (r"contra\s+(?:um|uma|o|a)?\s*(\w+)", "laner"),
+        # "tem uma caitlyn forte"
+        (r"(?:tem|ha|existe)\s+(?:um|uma|o|a)?\s*(\w+)\s+(?:forte|fed|feedado)", "fed"),
+        # "caitlyn e nami fortes"
+        (r"(\w+)\s+(?:e|and)\s+(\w+)\s+(?:fortes|feds|feedados|strong)", "fed_pair"),
+        # "malzahar também está forte"
+        (r"(\w+)\s+(?:tambem|also)\s+(?:esta|está|is|ta)\s+(?:forte|fed)", "fed"),
+        # "caitlyn está forte"
+        (r"(\w+)\s+(?:esta|está|is|ta)\s+(?:forte|fed|feedado|strong|ahead)", "fed"),
+        # "jax fraco/behind"
+        (r"(\w+)\s+(?:esta|está|is|ta)\s+(?:fraco|weak|behind|atras)", "behind"),
+        # "amassei o jax"
+        (r"(?:amassei|ganhei|venci|matei|destrui)\s+(?:o|a|do|da)?\s*(\w+)", "behind"),
+    )
+)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Alternância em forma de trie: o regex não retesta prefixos comuns a cada nome."""
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        # Fim de palavra no meio da trie: o resto fica opcional (guloso, o maior nome vence)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+# Campeões e aliases numa varredura só; "miss fortune" vence "miss" e
+# "jarvan iv" vence "jarvan" porque o sufixo opcional é guloso
+_CHAMPION_RE = re.compile(rf"\b(?:{_trie_pattern({*KNOWN_CHAMPIONS, *CHAMPION_ALIASES})})\b")
+
+_GOLD_PATTERNS = (
+    re.compile(r"(\d{3,5})\s*(gold|ouro|g)\b"),
+    re.compile(r"tenho\s*(\d{3,5})\b"),
+)
+
+_ITEM_PATTERN = re.compile(
+    r"(?P<subject>[a-z]+)\s+"
+    r"(?P<verb>fez|fechei|fechou|comprou|tenho|tem|ta com|to com|estou com|"
+    r"ta fazendo|to fazendo|estou fazendo|fazendo|fechando|comprando|buildando|"
+    r"has|have|built|building|buying|is building|is buying)\s+"
+    r"(?P<item>.+)$"
+)
+
+_NUMBER_PATTERN = re.compile(r"\b\d+\b")
+
+# Nenhum prefixo é prefixo de outro, então a ordem da alternância não importa
+_SELF_PREFIXES = {
+    "to com ": "has",
+    "estou com ": "has",
+    "tenho ": "has",
+    "i have ": "has",
+    "im with ": "has",
+    "i'm with ": "has",
+    "to fazendo ": "building",
+    "estou fazendo ": "building",
+    "im building ": "building",
+    "i'm building ": "building",
+    "fazendo ": "building",
+    "fechando ": "building",
+    "comprando ": "building",
+    "building ": "building",
+    "buying ": "building",
+}
 
+_SELF_PREFIX_RE = re.compile("|".join(map(re.escape, _SELF_PREFIXES)))
+
+# Palavra solta de nome composto -> campeão ("kench" -> "tahm kench"); na dúvida
+# vence a ordem de _CHAMPIONS_BY_LEN, por isso o reversed
+_CHAMPION_WORDS: dict[str, str] = {
+    word: champion for champion in reversed(_CHAMPIONS_BY_LEN) for word in champion.split()
+}
+
+_SELF_SUBJECTS = frozenset({"eu", "meu", "minha", "to", "estou", "i", "my"})
+
+# Sujeitos que apontam para o inimigo da rota sem nomear o campeão
+_ENEMY_SUBJECTS = frozenset(
+    {"inimigo", "oponente", "adversario", "ele", "ela", "enemy", "opponent", "he", "she"}
+)
+
+
+class _KeywordMatcher:
+    """Procura várias palavras-chave numa passada só sobre o texto.
+
+    Usa um autômato Aho-Corasick quando pyahocorasick está instalado; sem ele,
+    cai no laço de substrings. Rótulos valem na ordem em que foram cadastrados.
+    """
+
+    def __init__(self, table: Iterable[tuple[Any, Iterable[str]]]) -> None:
+        self._table = tuple((label, tuple(keywords)) for label, keywords in table)
+        self._automaton = None
+        if ahocorasick is not None:
+            # A mesma palavra pode aparecer em vários rótulos ("mid" é fase e rota)
+            entries: dict[str, list[tuple[int, Any]]] = {}
+            for priority, (label, keywords) in enumerate(self._table):
+                for keyword in keywords:
+                    entries.setdefault(keyword, []).append((priority, label))
+            automaton = ahocorasick.Automaton()
+            for keyword, labels in entries.items():
+                automaton.add_word(keyword, (keyword, tuple(labels)))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _hits(self, text: str) -> Iterable[tuple[int, Any]]:
+        for _, (_, labels) in self._automaton.iter(text):
+            yield from labels
+
+    def first(self, text: str) -> Any | None:
+        """Rótulo de maior prioridade com alguma palavra presente no texto."""
+        if self._automaton is not None:
+            best = min(self._hits(text), default=None)
+            return best[1] if best else None
+        for label, keywords in self._table:
+            if any(keyword in text for keyword in keywords):
+                return label
+        return None
+
+    def first_by_group(self, text: str) -> dict[str, str]:
+        """Como first(), mas por grupo, para rótulos no formato (grupo, valor)."""
+        best: dict[str, tuple[int, str]] = {}
+        if self._automaton is not None:
+            for priority, (group, value) in self._hits(text):
+                if group not in best or priority < best[group][0]:
+                    best[group] = (priority, value)
+        else:
+            for priority, ((group, value), keywords) in enumerate(self._table):
+                if group not in best and any(keyword in text for keyword in keywords):
+                    best[group] = (priority, value)
+        return {group: value for group, (_, value) in best.items()}
+
+
+_INTENT_MATCHER = _KeywordMatcher(INTENTS.items())
+
+# Status, fase e rota saem da mesma varredura; dentro de cada grupo vale a
+# ordem das checagens originais ("vantagem" vence "desvantagem")
+_HINT_MATCHER = _KeywordMatcher(
+    (
+        (("status", "ahead"), ("na frente", "vantagem")),
+        (("status", "behind"), ("atras", "desvantagem")),
+        (("status", "even"), ("empatado", "even")),
+        (("status", "ahead"), ("ahead",)),
+        (("status", "behind"), ("behind",)),
+        (("game_phase", "early"), ("early", "inicio", "comeco")),
+        (("game_phase", "mid"), ("mid", "meio")),
+        (("game_phase", "late"), ("late", "fim")),
+        (("lane", "top"), ("top",)),
+        (("lane", "mid"), ("mid", "meio")),
+        (("lane", "bot"), ("bot", "bottom", "dragao")),
+        (("lane", "jungle"), ("jg", "jungle", "selva")),
+        (("lane", "support"), ("sup", "support")),
+    )
+)
+
+
+# Frases curtas se repetem muito entre turnos ("e agora", "continuo"...)
+_TEXT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_TEXT_CACHE_SIZE)
+def infer_intent(text: str) -> str:
+    return _INTENT_MATCHER.first(text.lower()) or "general"
 
 
 def extract_state_hints(text: str) -> dict[str, Any]:
-    text_lower = _normalize(text)
+    return extract_state_hints_normalized(normalize(text))
+
+
+def extract_state_hints_normalized(text: str) -> dict[str, Any]:
+    """Como extract_state_hints, para texto que já passou por normalize()."""
+    # Cópia rasa do resultado em cache: o chamador pode mexer à vontade
+    hints = dict(_extract_state_hints_cached(text))
+    if "enemies" in hints:
+        hints["enemies"] = [dict(enemy) for enemy in hints["enemies"]]
+    return hints
+
+
+@lru_cache(maxsize=_TEXT_CACHE_SIZE)
+def _extract_state_hints_cached(text_lower: str) -> dict[str, Any]:
     hints: dict[str, Any] = {}
 
     gold = _extract_gold(text_lower)
     if gold is not None:
         hints["gold"] = gold
 
-    status = _extract_status(text_lower)
-    if status:
-        hints["status"] = status
-
-    phase = _extract_phase(text_lower)
-    if phase:
-        hints["game_phase"] = phase
-
-    lane = _extract_lane(text_lower)
-    if lane:
-        hints["lane"] = lane
+    found = _HINT_MATCHER.first_by_group(text_lower)
+    for key in ("status", "game_phase", "lane"):
+        if key in found:
+            hints[key] = found[key]
 
     # Extrai campeões mencionados
-    champions_data = extract_champions(text)
+    champions_data = _extract_champions_normalized(text_lower)
     if champions_data.get("player_champion"):
         hints["champion"] = champions_data["player_champion"]
     if champions_data.get("enemies"):
@@ -117,7 +310,10 @@ def extract_champions(text: str) -> dict[str, Any]:
     - player_champion: campeão do jogador (se identificado)
     - enemies: lista de inimigos com status
     """
-    text_lower = _normalize(text)
+    return _extract_champions_normalized(normalize(text))
+
+
+def _extract_champions_normalized(text_lower: str) -> dict[str, Any]:
     result: dict[str, Any] = {
         "player_champion": None,
         "enemies": [],
@@ -128,16 +324,8 @@ def extract_champions(text: str) -> dict[str, Any]:
     if not found_champions:
         return result
 
-    # Padrões para identificar o campeão do jogador
-    player_patterns = [
-        r"(?:estou|to|sou|jogo|jogando|vou)\s+(?:de|com)\s+(\w+)",
-        r"(?:meu|minha)\s+(\w+)",
-        r"(\w+)\s+(?:aqui|main|otp)",
-        r"(?:i am|i'm|im|playing)\s+(\w+)",
-    ]
-
-    for pattern in player_patterns:
-        match = re.search(pattern, text_lower)
+    for pattern in _PLAYER_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             potential = match.group(1)
             champion = _resolve_champion(potential)
@@ -146,29 +334,11 @@ def extract_champions(text: str) -> dict[str, Any]:
                 found_champions.remove(champion)
                 break
 
-    # Padrões para identificar inimigos e seus status
-    enemy_patterns = [
-        # "contra um jax no top"
-        (r"contra\s+(?:um|uma|o|a)?\s*(\w+)", "laner"),
-        # "tem uma caitlyn forte"
-        (r"(?:tem|ha|existe)\s+(?:um|uma|o|a)?\s*(\w+)\s+(?:forte|fed|feedado)", "fed"),
-        # "caitlyn e nami fortes"
-        (r"(\w+)\s+(?:e|and)\s+(\w+)\s+(?:fortes|feds|feedados|strong)", "fed_pair"),
-        # "malzahar também está forte"
-        (r"(\w+)\s+(?:tambem|also)\s+(?:esta|está|is|ta)\s+(?:forte|fed)", "fed"),
-        # "caitlyn está forte"
-        (r"(\w+)\s+(?:esta|está|is|ta)\s+(?:forte|fed|feedado|strong|ahead)", "fed"),
-        # "jax fraco/behind"
-        (r"(\w+)\s+(?:esta|está|is|ta)\s+(?:fraco|weak|behind|atras)", "behind"),
-        # "amassei o jax"
-        (r"(?:amassei|ganhei|venci|matei|destrui)\s+(?:o|a|do|da)?\s*(\w+)", "behind"),
-    ]
-
     enemies_with_status: list[dict[str, Any]] = []
     processed_enemies: set[str] = set()
 
-    for pattern, status_type in enemy_patterns:
-        for match in re.finditer(pattern, text_lower):
+    for pattern, status_type in _ENEMY_PATTERNS:
+        for match in pattern.finditer(text_lower):
             if status_type == "fed_pair":
                 # Captura par de campeões
                 for group_idx in [1, 2]:
@@ -221,30 +391,10 @@ def extract_champions(text: str) -> dict[str, Any]:
 
 
 def _find_all_champions(text: str) -> list[str]:
-    """Encontra todos os campeões mencionados no texto."""
-    found = []
-    text_words = set(text.split())
-
-    # Verifica aliases primeiro
-    for alias, champion in CHAMPION_ALIASES.items():
-        if alias in text or alias in text_words:
-            if champion not in found:
-                found.append(champion)
-
-    # Verifica campeões conhecidos (nomes completos primeiro, depois palavras únicas)
-    # Ordena por tamanho decrescente para pegar "miss fortune" antes de "miss"
-    sorted_champions = sorted(KNOWN_CHAMPIONS, key=len, reverse=True)
-    for champion in sorted_champions:
-        if champion in found:
-            continue
-        if " " in champion:
-            if champion in text:
-                found.append(champion)
-        else:
-            if re.search(rf"\\b{re.escape(champion)}\\b", text):
-                found.append(champion)
-
-    return found
+    """Encontra todos os campeões mencionados no texto, na ordem em que aparecem."""
+    return list(
+        dict.fromkeys(CHAMPION_ALIASES.get(name, name) for name in _CHAMPION_RE.findall(text))
+    )
 
 
 def _resolve_champion(name: str) -> str | None:
@@ -260,19 +410,26 @@ def _resolve_champion(name: str) -> str | None:
         return name_lower
 
     # Verifica se é parte de um nome composto
-    for champion in KNOWN_CHAMPIONS:
+    for champion in _CHAMPIONS_BY_LEN:
         if champion.startswith(name_lower) or name_lower in champion.split():
             return champion
 
     return None
 
 
-def analyze_team_composition(enemies: list[dict[str, Any]]) -> dict[str, Any]:
+def analyze_team_composition(
+    enemies: list[dict[str, Any]],
+    get_info: Callable[[str], dict[str, Any] | None] | None = None,
+) -> dict[str, Any]:
     """
     Analisa a composição do time inimigo.
     Retorna análise com tipos de dano, ameaças principais, etc.
+    get_info permite reaproveitar as buscas de campeão já feitas pelo chamador.
     """
-    from app import game_data
+    if get_info is None:
+        from app import game_data
+
+        get_info = game_data.get_champion_info
 
     analysis = {
         "damage_physical": 0,
@@ -290,7 +447,7 @@ def analyze_team_composition(enemies: list[dict[str, Any]]) -> dict[str, Any]:
         status = enemy.get("status", "even")
 
         # Busca info do campeão
-        info = game_data.get_champion_info(champion_name)
+        info = get_info(champion_name)
         if not info:
             continue
 
@@ -342,7 +499,11 @@ def analyze_team_composition(enemies: list[dict[str, Any]]) -> dict[str, Any]:
 
 
 def extract_item_hints(text: str) -> dict[str, Any]:
-    normalized = _normalize(text)
+    return extract_item_hints_normalized(normalize(text))
+
+
+def extract_item_hints_normalized(normalized: str) -> dict[str, Any]:
+    """Como extract_item_hints, para texto que já passou por normalize()."""
     prefix_match = _extract_self_prefix_item(normalized)
     if prefix_match:
         return {
@@ -369,9 +530,18 @@ def extract_item_hints(text: str) -> dict[str, Any]:
             }
         }
 
+    # Só campeão conhecido; sujeito genérico fica sem nome (quem chama usa o inimigo
+    # da sessão) e qualquer outra palavra é descartada
+    if subject in _ENEMY_SUBJECTS:
+        champion = None
+    else:
+        champion = _resolve_item_subject(subject)
+        if champion is None:
+            return {}
+
     return {
         "enemy_item": {
-            "champion": subject,
+            "champion": champion,
             "item": item,
             "status": status,
         }
@@ -379,70 +549,42 @@ def extract_item_hints(text: str) -> dict[str, Any]:
 
 
 def _extract_gold(text: str) -> int | None:
-    patterns = [
-        r"(\\d{3,5})\\s*(gold|ouro|g)\\b",
-        r"tenho\\s*(\\d{3,5})\\b",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _GOLD_PATTERNS:
+        match = pattern.search(text)
         if match:
             return int(match.group(1))
     return None
 
 
-def _extract_status(text: str) -> str | None:
-    if "na frente" in text or "vantagem" in text:
-        return "ahead"
-    if "atras" in text or "desvantagem" in text:
-        return "behind"
-    if "empatado" in text or "even" in text:
-        return "even"
-    if "ahead" in text:
-        return "ahead"
-    if "behind" in text:
-        return "behind"
-    return None
-
-
-def _extract_phase(text: str) -> str | None:
-    if "early" in text or "inicio" in text or "comeco" in text:
-        return "early"
-    if "mid" in text or "meio" in text:
-        return "mid"
-    if "late" in text or "fim" in text:
-        return "late"
-    return None
+def _strip_accents(text: str) -> str:
+    normalized = unicodedata.normalize("NFD", text)
+    return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
 
 
-def _extract_lane(text: str) -> str | None:
-    if "top" in text:
-        return "top"
-    if "mid" in text or "meio" in text:
-        return "mid"
-    if "bot" in text or "bottom" in text or "dragao" in text:
-        return "bot"
-    if "jg" in text or "jungle" in text or "selva" in text:
-        return "jungle"
-    if "sup" in text or "support" in text:
-        return "support"
-    return None
+# Latin-1 e Latin Extended-A/B acentuados -> ASCII, derivado do próprio NFD
+_ACCENT_TABLE = str.maketrans(
+    {
+        ch: stripped
+        for ch in map(chr, range(0xC0, 0x250))
+        if (stripped := _strip_accents(ch)) != ch and stripped.isascii()
+    }
+)
 
 
-def _normalize(text: str) -> str:
-    normalized = unicodedata.normalize("NFD", text)
-    normalized = "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
-    return normalized.lower()
+def normalize(text: str) -> str:
+    """Minúsculas e sem acentos: a forma que todos os extratores esperam."""
+    # Texto já ASCII (checagem O(1) no CPython) não tem acento a tirar
+    if text.isascii():
+        return text.lower()
+    translated = text.translate(_ACCENT_TABLE)
+    if translated.isascii():
+        return translated.lower()
+    # Caractere fora da tabela (ex.: acento já decomposto): caminho completo
+    return _strip_accents(text).lower()
 
 
 def _extract_item_match(text: str) -> dict[str, str] | None:
-    pattern = (
-        r"(?P<subject>[a-z]+)\\s+"
-        r"(?P<verb>fez|fechei|fechou|comprou|tenho|tem|ta com|to com|estou com|"
-        r"ta fazendo|to fazendo|estou fazendo|fazendo|fechando|comprando|buildando|"
-        r"has|have|built|building|buying|is building|is buying)\\s+"
-        r"(?P<item>.+)$"
-    )
-    match = re.search(pattern, text)
+    match = _ITEM_PATTERN.search(text)
     if not match:
         return None
     return {
@@ -453,31 +595,33 @@ def _extract_item_match(text: str) -> dict[str, str] | None:
 
 
 def _extract_self_prefix_item(text: str) -> dict[str, str] | None:
-    prefixes = [
-        ("to com ", "has"),
-        ("estou com ", "has"),
-        ("tenho ", "has"),
-        ("i have ", "has"),
-        ("im with ", "has"),
-        ("i'm with ", "has"),
-        ("to fazendo ", "building"),
-        ("estou fazendo ", "building"),
-        ("im building ", "building"),
-        ("i'm building ", "building"),
-        ("fazendo ", "building"),
-        ("fechando ", "building"),
-        ("comprando ", "building"),
-        ("building ", "building"),
-        ("buying ", "building"),
-    ]
-    for prefix, status in prefixes:
-        if text.startswith(prefix):
-            item = text[len(prefix) :].strip()
-            if not item or re.search(r"\\b\\d+\\b", item) or "gold" in item or "ouro" in item:
-                return None
-            return {"item": item, "status": status}
-    return None
+    match = _SELF_PREFIX_RE.match(text)
+    if not match:
+        return None
+    item = text[match.end() :].strip()
+    if not item or _NUMBER_PATTERN.search(item) or "gold" in item or "ouro" in item:
+        return None
+    return {"item": item, "status": _SELF_PREFIXES[match.group()]}
+
+
+def canonical_champion(name: str) -> str:
+    """Chave canônica para um nome livre de campeão ("Zed" -> "zed", "MF" -> "miss fortune")."""
+    key = normalize(name).strip()
+    # Mesma busca dos textos do usuário; o apóstrofo some para "kai'sa" casar com kaisa
+    found = _find_all_champions(key.replace("'", ""))
+    if len(found) == 1:
+        return found[0]
+    return _resolve_item_subject(key) or key
+
+
+def _resolve_item_subject(subject: str) -> str | None:
+    """Como _resolve_champion, mas sem casar por prefixo ("ja comprou" não vira jax)."""
+    if subject in CHAMPION_ALIASES:
+        return CHAMPION_ALIASES[subject]
+    if subject in KNOWN_CHAMPIONS:
+        return subject
+    return _CHAMPION_WORDS.get(subject)
 
 
 def _is_self_subject(subject: str) -> bool:
-    return subject in {"eu", "meu", "minha", "to", "estou", "i", "my"}
+    return subject in _SELF_SUBJECTS
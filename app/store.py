@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
 from typing import Any
 from uuid import uuid4
 
+import orjson
+
 from app.config import MAX_HISTORY, REDIS_URL, SESSION_TTL_SECONDS
 
 try:
@@ -16,7 +17,7 @@ except ImportError:  # pragma: no cover - optional dependency
 logger = logging.getLogger("nexuscoach")
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     session_id: str
     state: dict[str, Any]
@@ -37,6 +38,12 @@ class BaseStore:
     def append_history(self, session_id: str, item: dict[str, Any]) -> Session | None:
         raise NotImplementedError
 
+    def apply_turn(
+        self, session_id: str, updates: dict[str, Any], item: dict[str, Any]
+    ) -> Session | None:
+        """Aplica o estado e o histórico de um turno numa única escrita."""
+        raise NotImplementedError
+
     def end_session(self, session_id: str) -> Session | None:
         raise NotImplementedError
 
@@ -71,18 +78,54 @@ class MemoryStore(BaseStore):
         session = self._sessions.get(session_id)
         if session is None:
             return None
-        session.history.append(item)
-        if len(session.history) > MAX_HISTORY:
-            session.history = session.history[-MAX_HISTORY:]
+        _append_item(session, item)
+        return session
+
+    def apply_turn(
+        self, session_id: str, updates: dict[str, Any], item: dict[str, Any]
+    ) -> Session | None:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        session.state.update(updates)
+        _append_item(session, item)
         return session
 
     def end_session(self, session_id: str) -> Session | None:
         return self._sessions.pop(session_id, None)
 
 
+# Só escreve se a sessão ainda existe (não ressuscita sessão encerrada): grava os
+# campos de estado alterados, empilha o item no histórico, apara e renova o TTL
+_APPLY_TURN_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+if #ARGV > 3 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+end
+if ARGV[3] ~= '' then
+    redis.call('RPUSH', KEYS[2], ARGV[3])
+    redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return {redis.call('HGETALL', KEYS[1]), redis.call('LRANGE', KEYS[2], 0, -1)}
+"""
+
+_STATE_PREFIX = b"state:"
+
+
 class RedisStore(BaseStore):
+    """Sessão num HASH (um campo por chave de estado) e histórico numa LIST.
+
+    Cada turno grava só os campos alterados e o item novo, em vez de reserializar
+    a sessão inteira.
+    """
+
     def __init__(self, client: "redis.Redis") -> None:
         self._client = client
+        self._apply_script = client.register_script(_APPLY_TURN_LUA)
 
     def create_session(self, initial_state: dict[str, Any], locale: str) -> Session:
         session_id = str(uuid4())
@@ -93,64 +136,95 @@ class RedisStore(BaseStore):
         }
         state.update(initial_state)
         session = Session(session_id=session_id, state=state, locale=locale, history=[])
-        self._set_session(session)
+        key = self._key(session_id)
+        mapping = {"session_id": session_id, "locale": locale, **_state_fields(state)}
+        with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping).expire(key, SESSION_TTL_SECONDS).execute()
         return session
 
     def get_session(self, session_id: str) -> Session | None:
-        payload = self._client.get(self._key(session_id))
-        if not payload:
-            return None
-        return self._decode(payload)
+        key = self._key(session_id)
+        with self._client.pipeline(transaction=False) as pipe:
+            fields, history = pipe.hgetall(key).lrange(self._history_key(key), 0, -1).execute()
+        return self._decode(fields, history)
 
     def update_session(self, session_id: str, updates: dict[str, Any]) -> Session | None:
-        session = self.get_session(session_id)
-        if session is None:
-            return None
-        session.state.update(updates)
-        self._set_session(session)
-        return session
+        return self._apply(session_id, updates, None)
 
     def append_history(self, session_id: str, item: dict[str, Any]) -> Session | None:
-        session = self.get_session(session_id)
-        if session is None:
-            return None
-        session.history.append(item)
-        if len(session.history) > MAX_HISTORY:
-            session.history = session.history[-MAX_HISTORY:]
-        self._set_session(session)
-        return session
+        return self._apply(session_id, {}, item)
+
+    def apply_turn(
+        self, session_id: str, updates: dict[str, Any], item: dict[str, Any]
+    ) -> Session | None:
+        return self._apply(session_id, updates, item)
 
     def end_session(self, session_id: str) -> Session | None:
-        session = self.get_session(session_id)
-        if session is None:
-            return None
-        self._client.delete(self._key(session_id))
-        return session
+        # Leitura + DELETE numa transação só: uma ida ao Redis e sem encerrar duas vezes
+        key = self._key(session_id)
+        history_key = self._history_key(key)
+        with self._client.pipeline(transaction=True) as pipe:
+            fields, history, _ = (
+                pipe.hgetall(key).lrange(history_key, 0, -1).delete(key, history_key).execute()
+            )
+        return self._decode(fields, history)
 
     def _key(self, session_id: str) -> str:
-        return f"session:{session_id}"
-
-    def _set_session(self, session: Session) -> None:
-        payload = json.dumps(
-            {
-                "session_id": session.session_id,
-                "state": session.state,
-                "locale": session.locale,
-                "history": session.history,
-            }
-        )
-        self._client.setex(self._key(session.session_id), SESSION_TTL_SECONDS, payload)
+        # Prefixo novo: as sessões antigas (JSON em string) só expiram pelo TTL
+        return f"session:h:{session_id}"
+
+    def _history_key(self, key: str) -> str:
+        return f"{key}:history"
+
+    def _apply(
+        self, session_id: str, updates: dict[str, Any], item: dict[str, Any] | None
+    ) -> Session | None:
+        key = self._key(session_id)
+        args: list[Any] = [
+            SESSION_TTL_SECONDS,
+            MAX_HISTORY,
+            _dumps(item) if item is not None else b"",
+        ]
+        for field, value in _state_fields(updates).items():
+            args.append(field)
+            args.append(value)
+        result = self._apply_script(keys=[key, self._history_key(key)], args=args)
+        if not result:
+            return None
+        flat, history = result
+        return self._decode(dict(zip(flat[::2], flat[1::2])), history)
 
-    def _decode(self, payload: bytes) -> Session:
-        data = json.loads(payload)
+    def _decode(self, fields: dict[bytes, bytes], history: list[bytes]) -> Session | None:
+        if not fields:
+            return None
+        state = {
+            name[len(_STATE_PREFIX) :].decode(): orjson.loads(value)
+            for name, value in fields.items()
+            if name.startswith(_STATE_PREFIX)
+        }
+        locale = fields.get(b"locale")
         return Session(
-            session_id=data["session_id"],
-            state=data["state"],
-            locale=data.get("locale", "pt-BR"),
-            history=data.get("history", []),
+            session_id=fields[b"session_id"].decode(),
+            state=state,
+            locale=locale.decode() if locale else "pt-BR",
+            history=[orjson.loads(entry) for entry in history],
         )
 
 
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _state_fields(state: dict[str, Any]) -> dict[bytes, bytes]:
+    return {_STATE_PREFIX + str(name).encode(): _dumps(value) for name, value in state.items()}
+
+
+def _append_item(session: Session, item: dict[str, Any]) -> None:
+    session.history.append(item)
+    if len(session.history) > MAX_HISTORY:
+        session.history = session.history[-MAX_HISTORY:]
+
+
 _store: BaseStore | None = None
 
 
@@ -1,18 +1,39 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 
 from app.i18n import msg
 from app.llm import generate_reply as llm_generate_reply
 
+_TEMPLATED_INTENTS = frozenset({"status"})
+_STATUSES = frozenset({"ahead", "behind", "even"})
+_PHASES = frozenset({"early", "mid", "late"})
+_ITEM_REPLY_INTENTS = frozenset({"build", "general"})
 
-def generate_reply(
+# Resposta de fallback por intenção (sem LLM): (locale, fase, última resposta) -> texto
+_FallbackReply = Callable[[str | None, str, str | None], str | None]
+
+_FALLBACK_REPLIES: dict[str, _FallbackReply] = {
+    "build": lambda locale, phase, last_reply: msg(locale, "build_defensive"),
+    "all_in": lambda locale, phase, last_reply: msg(
+        locale, "all_in_early" if phase == "early" else "all_in_advantage"
+    ),
+    "objective": lambda locale, phase, last_reply: msg(locale, "objective"),
+    "macro": lambda locale, phase, last_reply: msg(locale, "macro"),
+    "follow_up": lambda locale, phase, last_reply: (
+        msg(locale, "follow_up", last_reply=last_reply) if last_reply else None
+    ),
+}
+
+
+async def generate_reply(
     state: dict[str, Any],
     intent: str,
     history: list[dict[str, Any]],
-    advice: list[str],
+    advice: list[dict[str, Any]],
     locale: str | None,
     user_text: str,
+    corrections: list[dict[str, Any]] | None = None,
 ) -> str:
     champion = state.get("champion", "")
     enemy = state.get("enemy", "")
@@ -27,54 +48,55 @@ def generate_reply(
     context_bits = []
     if gold is not None:
         context_bits.append(f"{gold} gold" if locale and locale.startswith("en") else f"{gold} de ouro")
-    if status in {"ahead", "behind", "even"}:
+    if status in _STATUSES:
         if locale and locale.startswith("en"):
             context_bits.append(status)
         else:
             context_bits.append(
                 "na frente" if status == "ahead" else "atrás" if status == "behind" else "empatado"
             )
-    if phase in {"early", "mid", "late"}:
+    if phase in _PHASES:
         context_bits.append(phase)
     context_hint = ""
     if context_bits:
         context_hint = " (" + ", ".join(context_bits) + ")"
 
-    llm_reply = llm_generate_reply(
+    # Atualização de status com dica aprovada (score positivo) para o mesmo campeão
+    # e intenção: responde direto do template, sem a ida ao LLM
+    if intent in _TEMPLATED_INTENTS:
+        approved = _approved_advice(advice, champion, intent)
+        if approved:
+            return msg(locale, f"{intent}_ack", context=context_hint, advice=approved)
+
+    llm_reply = await llm_generate_reply(
         state=state,
         intent=intent,
         history=history,
         advice=advice,
         locale=locale,
         user_text=user_text,
+        corrections=corrections,
     )
     if llm_reply:
         return llm_reply
 
-    if intent == "build":
-        return msg(locale, "build_defensive")
-    if intent == "all_in":
-        if phase == "early":
-            return msg(locale, "all_in_early")
-        return msg(locale, "all_in_advantage")
-    if intent == "objective":
-        return msg(locale, "objective")
-    if intent == "macro":
-        return msg(locale, "macro")
-    if intent == "follow_up" and last_reply:
-        return msg(locale, "follow_up", last_reply=last_reply)
-
-    if last_enemy_item and intent in {"build", "general"}:
+    handler = _FALLBACK_REPLIES.get(intent)
+    if handler is not None:
+        reply = handler(locale, phase, last_reply)
+        if reply:
+            return reply
+
+    if last_enemy_item and intent in _ITEM_REPLY_INTENTS:
         champ = last_enemy_item.get("champion")
         item = last_enemy_item.get("item")
         if champ and item:
             return msg(locale, "enemy_item", champion=champ, item=item)
 
-    if last_self_item and intent in {"build", "general"}:
+    if last_self_item and intent in _ITEM_REPLY_INTENTS:
         return msg(locale, "self_item", item=last_self_item)
 
     if advice:
-        return advice[0]
+        return advice[0]["reply_text"]
 
     if champion and enemy and lane:
         return msg(
@@ -87,3 +109,18 @@ def generate_reply(
         )
 
     return msg(locale, "need_context")
+
+
+def _approved_advice(advice: list[dict[str, Any]], champion: str, intent: str) -> str | None:
+    """Primeira dica bem avaliada do mesmo campeão e intenção (o ranking não filtra)."""
+    if not champion:
+        return None
+    champion = champion.lower()
+    for row in advice:
+        if (
+            (row["champion"] or "").lower() == champion
+            and row["intent"] == intent
+            and (row["score"] or 0) > 0
+        ):
+            return row["reply_text"]
+    return None
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-import tempfile
-from typing import Optional
+import threading
+from functools import lru_cache
+from typing import Any, BinaryIO, Optional
 
 from openai import OpenAI
 
@@ -10,14 +11,16 @@ from app.errors import AppError
 from app.i18n import msg
 
 _whisper_model = None
+_whisper_lock = threading.Lock()
 
 
-def transcribe_audio(content: bytes, locale: Optional[str]) -> str:
+def transcribe_audio(audio: BinaryIO, locale: Optional[str]) -> str:
+    """Transcreve o áudio lendo direto do arquivo do upload, sem cópia em memória."""
     provider = STT_PROVIDER.lower()
     if provider == "openai":
-        return _transcribe_openai(content, locale)
+        return _transcribe_openai(audio, locale)
     if provider == "local":
-        return _transcribe_local(content, locale)
+        return _transcribe_local(audio, locale)
     raise AppError(
         code="STT_FAILED",
         user_message=msg(locale, "stt_failed"),
@@ -25,23 +28,26 @@ def transcribe_audio(content: bytes, locale: Optional[str]) -> str:
     )
 
 
-def _transcribe_openai(content: bytes, locale: Optional[str]) -> str:
+@lru_cache(maxsize=1)
+def _get_openai_client() -> OpenAI:
+    """Cliente OpenAI único do processo, para reaproveitar o pool de conexões entre turnos."""
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+
+def _transcribe_openai(audio: BinaryIO, locale: Optional[str]) -> str:
     if not OPENAI_API_KEY:
         raise AppError(
             code="STT_FAILED",
             user_message=msg(locale, "stt_failed"),
             status_code=500,
         )
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-        tmp.write(content)
-        tmp.flush()
-        with open(tmp.name, "rb") as audio_file:
-            kwargs = {"model": WHISPER_MODEL, "file": audio_file}
-            language = _locale_to_language(locale)
-            if language:
-                kwargs["language"] = language
-            response = client.audio.transcriptions.create(**kwargs)
+    client = _get_openai_client()
+    # O nome só informa o formato ao endpoint; o conteúdo sai do próprio arquivo
+    kwargs = {"model": WHISPER_MODEL, "file": ("audio.wav", audio)}
+    language = _locale_to_language(locale)
+    if language:
+        kwargs["language"] = language
+    response = client.audio.transcriptions.create(**kwargs)
     text = response.text.strip()
     if not text:
         raise AppError(
@@ -52,7 +58,7 @@ def _transcribe_openai(content: bytes, locale: Optional[str]) -> str:
     return text
 
 
-def _transcribe_local(content: bytes, locale: Optional[str]) -> str:
+def _transcribe_local(audio: BinaryIO, locale: Optional[str]) -> str:
     try:
         from faster_whisper import WhisperModel
     except Exception as exc:
@@ -62,16 +68,9 @@ def _transcribe_local(content: bytes, locale: Optional[str]) -> str:
             status_code=500,
         ) from exc
 
-    global _whisper_model
-    if _whisper_model is None:
-        _whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
-
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-        tmp.write(content)
-        tmp.flush()
-        segments, _ = _whisper_model.transcribe(
-            tmp.name, language=_locale_to_language(locale)
-        )
+    # faster-whisper decodifica direto de um file-like
+    model = _get_whisper_model(WhisperModel)
+    segments, _ = model.transcribe(audio, language=_locale_to_language(locale))
     text = " ".join(segment.text.strip() for segment in segments).strip()
     if not text:
         raise AppError(
@@ -82,6 +81,16 @@ def _transcribe_local(content: bytes, locale: Optional[str]) -> str:
     return text
 
 
+def _get_whisper_model(model_cls: Any) -> Any:
+    """Carrega o modelo uma vez só, mesmo com os primeiros turnos chegando juntos."""
+    global _whisper_model
+    if _whisper_model is None:
+        with _whisper_lock:
+            if _whisper_model is None:
+                _whisper_model = model_cls("base", device="cpu", compute_type="int8")
+    return _whisper_model
+
+
 def _locale_to_language(locale: Optional[str]) -> Optional[str]:
     if not locale:
         return None
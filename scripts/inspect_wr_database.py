@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 # Allow running from scripts/ without installing the package.
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -30,6 +31,13 @@ def _find_sample(champs: list[dict]) -> dict | None:
     return None
 
 
+def _try_fetch(url: str) -> tuple[Any, Exception | None]:
+    try:
+        return _fetch_json(url), None
+    except Exception as exc:
+        return None, exc
+
+
 def main() -> None:
     _print_header("Lista de campeoes (wr-database)")
     data = _fetch_json(WR_DATABASE_CHAMPIONS)
@@ -70,10 +78,12 @@ def main() -> None:
     urls = [url for url in candidates if url and not (url in seen or seen.add(url))]
 
     _print_header("Detalhe do campeao")
-    for url in urls:
-        try:
-            payload = _fetch_json(url)
-        except Exception as exc:
+    # Dispara todas as URLs juntas; o resultado é lido na ordem de preferência,
+    # então a espera total vira a da mais lenta, não a soma das que falham
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    results = executor.map(_try_fetch, urls)
+    for url, (payload, exc) in zip(urls, results):
+        if exc is not None:
             print(f"Falha ao buscar {url}: {exc}")
             continue
 
@@ -91,6 +101,7 @@ def main() -> None:
             value = detail.get(key)
             print(f"- {key}: {type(value).__name__}")
         break
+    executor.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
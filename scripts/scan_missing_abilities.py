@@ -31,9 +31,9 @@ def main() -> None:
             """
         ).fetchall()
 
-    print(f"Champions missing abilities: {len(rows)}")
-    for hero_id, name in rows:
-        print(f"- {name} ({hero_id})")
+    lines = [f"Champions missing abilities: {len(rows)}"]
+    lines.extend(f"- {name} ({hero_id})" for hero_id, name in rows)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app import db
+from app import db, migrations
 
 logger = logging.getLogger("nexuscoach")
 
@@ -39,4 +39,5 @@ def apply() -> None:
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
+    migrations.run_migrations()
     apply()
@@ -4,14 +4,12 @@ import logging
 import sys
 from pathlib import Path
 
-import psycopg
-
 # Allow running from scripts/ without installing the package.
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from app import db, game_data
+from app import game_data, migrations
 from app.config import POSTGRES_DSN
 from scripts import seed_corrections
 
@@ -22,8 +20,7 @@ def main() -> None:
 
     logging.basicConfig(level=logging.INFO)
 
-    with psycopg.connect(POSTGRES_DSN) as conn:
-        db._ensure_tables(conn)
+    migrations.run_migrations()
 
     results = game_data.sync_all()
     seed_corrections.apply()
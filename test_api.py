@@ -33,4 +33,23 @@ r = requests.post(f"{BASE}/session/end", json={
 })
 print(f"   Status: {r.status_code}")
 
+# 4. Itens do inimigo: sujeito generico ("o inimigo") e nomeado ("zed") caem na mesma chave
+print("\n4. Registrando itens do Zed por sujeito generico e nomeado...")
+r = requests.post(f"{BASE}/session/start", json={
+    "locale": "pt-BR",
+    "device_id": "test-script-2",
+    "initial_context": {"champion": "Yasuo", "lane": "mid", "enemy": "Zed"}
+})
+items_session_id = r.json()["data"]["session_id"]
+for text in ("o inimigo comprou ampulheta de zhonya", "zed comprou mortal reminder"):
+    r = requests.post(f"{BASE}/turn", json={
+        "session_id": items_session_id,
+        "text": text,
+        "context": {}
+    })
+enemy_items = r.json()["data"]["updated_state"]["enemy_items"]
+print(f"   enemy_items: {enemy_items}")
+assert enemy_items == {"zed": ["ampulheta de zhonya", "mortal reminder"]}, enemy_items
+requests.post(f"{BASE}/session/end", json={"session_id": items_session_id})
+
 print("\nTeste concluido!")